@@ -21,31 +21,69 @@ CONTROLS:
     E / R / T / Y       Cycles through trigonometry functions to be applied to the design equations
     D / F / G / H       Cycles through trigonometry functions to be applied to the design equations
     C / V / B / N / M   Cycles through trigonometry functions to be applied to the design equations
+    P                   Cycles through the color palettes in palettes.json
+    I                   Cycles through the render backends (scene, instanced scene, OpenGL scene, direct painter)
+    O                   Shows or hides the frame-time HUD
+    K                   Exports the recent frame timings as CSV and Chrome trace JSON (to profiles/)
+    L                   Switches adaptive level of detail on or off
+    U                   Starts or stops recording the session's key presses (to recordings/)
+    0                   Starts or stops streaming the show into a video (to recordings/, needs ffmpeg)
+    J                   Marks the ends of a ping-pong loop, then clears it
+    , / .               Seeks one second backward / forward
+    - / =               Lowers / raises the render scale of the direct painter backend
+    F1 - F12            Switches to a preset from presets.json (Ctrl + F1 - F12 saves the current design)
 """
 
+import time
+
+# Startup is timed from here, before the heavier imports below. What only the tools behind a key use
+# (recording, video streaming, presets, the OpenGL check) is imported when it is first used instead.
+STARTUP_START = time.perf_counter()
+
+import os
 import sys
-from PyQt5.QtWidgets import *
-from PyQt5.QtGui import *
-from PyQt5.QtCore import *
-from PyQt5 import uic, QtWidgets
-from math import *
+from math import sin, cos, tan
+from PyQt5.QtWidgets import QApplication, QFrame, QGraphicsScene, QLabel, QWidget
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen
+from PyQt5.QtCore import QElapsedTimer, QPointF, QRectF, QSizeF, QTimer, Qt
+from line_art.startup import StartupTimer
+from line_art.layout import setup_layout
+from line_art.item_pool import RectItemPool
+from line_art.instancing import InstancedRowPool
+from line_art.clock import AnimationClock
+from line_art.palette import load_gradients, color_table, pen_table, find_gradient
+from line_art.params import DesignParams, SIMULATION_RATE, ROW_STEPS_PER_STEP, FORWARD, BACKWARD, PAUSED
+from line_art.render import background_brush, OffscreenRenderer
+from line_art.controls import ControlState
+from line_art.profiler import FrameProfiler
+from line_art.lod import DetailController, levels_for
+from line_art.frame_cache import FrameCache, Timeline, PingPongLoop
+from line_art.geometry import design_slots
+from line_art.geometry_worker import GeometryWorker
+from line_art.viewport import use_raster_viewport
+
+startup_timer = StartupTimer(STARTUP_START)
+startup_timer.mark('imports')
 
 
 class ArtInvention(QWidget):
     """Overall class to create the Invention."""
 
-    # Determine the screen settings
-    q_app = QtWidgets.QApplication(sys.argv)
-    screen = q_app.primaryScreen()
-    screen_size = screen.availableGeometry()
-
     def __init__(self, parent=None):
         """A method to control image settings, as well as run all class methods."""
 
         super(ArtInvention, self).__init__(parent)
 
-        # Load gui blueprint
-        uic.loadUi("New-Line-Art-Designer_Layout.ui", self)
+        # Determine the screen settings. The QApplication must already exist.
+        self.screen_size = QApplication.primaryScreen().availableGeometry()
+
+        # Build the gui blueprint from its compiled layout module
+        self.startup_timer = startup_timer
+        self.startup_report = False
+        self.quit_after_startup = False
+        self.layout_ui = setup_layout(self)
+        self.graphicsView = self.layout_ui.graphicsView
+        self.startup_timer.mark('layout')
 
         # General settings
         self.title = 'Art Invention 06'
@@ -58,6 +96,17 @@ class ArtInvention(QWidget):
         self.starting_point = 1
         self.speed = 0.01
         self.design_colors = []
+        self.design_pens = []
+
+        # Color palettes, loaded from palettes.json. The first one is the default.
+        self.gradients = load_gradients()
+        self.gradient_index = 0
+
+        # Animation timing. The starting point moves by speed once per row of the default design
+        # (12 rows) on every fixed simulation step, independent of how often frames are drawn.
+        self.target_fps = 60
+        self.simulation_rate = SIMULATION_RATE
+        self.row_steps_per_step = ROW_STEPS_PER_STEP
 
         # Window setup. Window may be set to custom size or opened fullscreen (the default view).
         self.setWindowTitle(self.title)
@@ -69,6 +118,44 @@ class ArtInvention(QWidget):
         self.graphicsView.setScene(self.scene)
         self.image = QImage(self.size(), QImage.Format_RGB32)
         self.graphicsView.setFrameShape(QFrame.NoFrame)
+        use_raster_viewport(self.graphicsView)
+
+        # Persistent scene items: one pooled rectangle per (i, j) slot, plus the background outline.
+        # The instanced backend draws with one path item per row instead.
+        self.item_pool = RectItemPool(self.scene)
+        self.row_pool = InstancedRowPool(self.scene)
+        self.background_item = None
+        self.background_key = None
+
+        # Render backends: 'Scene' keeps pooled QGraphicsScene items, 'Instanced' draws every row's
+        # rotated rectangles as one path item, 'OpenGL' draws the pooled items through an OpenGL viewport
+        # (where a context can be created, which is checked when it is first switched to), 'Painter'
+        # paints each frame straight onto self.image with a QPainter, which paintEvent then blits to the window
+        self.render_backends = ['Scene', 'Instanced', 'OpenGL', 'Painter']
+        self.render_backend = 'Scene'
+        self.painter_renderer = None
+        self.antialias = False
+
+        # The painter backend can draw into an image smaller than the window, which is then upscaled
+        # with smooth filtering. The scale set here is lowered further by adaptive level of detail.
+        self.render_scales = [1.0, 0.75, 0.5, 0.25]
+        self.render_scale = 1.0
+
+        # Adaptive level of detail: while frames run over budget, fewer and thinner rectangles are drawn
+        self.lod = DetailController(self.target_fps, levels_for(self.antialias))
+
+        # Evaluated frames are cached by parameters and starting point, so playing backwards,
+        # seeking and ping-pong loops redraw already visited frames without recomputing them
+        self.frame_cache = FrameCache()
+        self.timeline = Timeline(self.frame_cache, self.image_width)
+        self.loop_mark = None
+
+        # While the design animates, the next frame's geometry is evaluated on a worker thread
+        self.geometry_worker = GeometryWorker()
+
+        # While paused, key presses redraw the design, recomputing only what the change affects
+        self.design_shown = False
+        self.paused_params = None
 
         # Booleans
         self.allow_image_movement = False
@@ -99,6 +186,7 @@ class ArtInvention(QWidget):
 
         # Create a list of possible trigonometric functions to be used for the design equations
         self.trig_options = [float, sin, cos, tan]
+        self.trig_by_name = {self.trig_update(trig): trig for trig in self.trig_options}
 
         # Create a list of operators to use for the design equation
         self.op_list = ['/', '-', '/', '/', '-', '+', '+']
@@ -107,7 +195,7 @@ class ArtInvention(QWidget):
         self.op_options = ['+', '-', '*', '/']
 
         # Create the text label
-        self.label = self.findChild(QLabel, "text_label")
+        self.label = self.layout_ui.text_label
 
         # Create a dictionary to display stats for the label
         self.display_dict = {
@@ -180,19 +268,120 @@ class ArtInvention(QWidget):
                 'state_02': 'None',
                 'state_03': 'None',
                 'state_04': 'None'
+            },
+            '11_palette': {
+                'controls': 'P',
+                'name': 'Palette',
+                'state': self.gradients[self.gradient_index].name
+            },
+            '12_render_backend': {
+                'controls': 'I',
+                'name': 'Render backend',
+                'state': self.render_backend
+            },
+            '13_adaptive_lod': {
+                'controls': 'L',
+                'name': 'Adaptive detail',
+                'state': 'On'
+            },
+            '14_recording': {
+                'controls': 'U',
+                'name': 'Recording',
+                'state': 'Off'
+            },
+            '15_loop': {
+                'controls': 'J',
+                'name': 'Ping-pong loop',
+                'state': 'Off'
+            },
+            '16_preset': {
+                'controls': 'F1-F12',
+                'name': 'Preset',
+                'state': 'None'
+            },
+            '17_render_scale': {
+                'controls': '- / =',
+                'name': 'Render scale',
+                'state': self.render_scale_text()
+            },
+            '18_video_stream': {
+                'controls': '0',
+                'name': 'Video stream',
+                'state': 'Off'
             }
         }
 
-        self.label_font_size = [[6.5, 200, 150],
-                                [9, 250, 200],
-                                [12, 350, 325]],
+        # Observe the display dictionary so the label is only rebuilt after a value changed
+        self.controls = ControlState(self.display_dict)
+        self.display_dict = self.controls.fields
+
+        self.label_font_size = [[6.5, 320, 270],
+                                [9, 410, 360],
+                                [12, 565, 545]],
 
         self.label_font_size_index = 0
 
-        self.display_stats()
+        # The label's colors are set once; its font is switched between cached QFonts
+        self.label_fonts = []
+        for font_size in self.label_font_size[0]:
+            font = QFont("MS Shell Dlg 2")
+            font.setPointSizeF(font_size[0])
+            self.label_fonts.append(font)
+        self.label.setStyleSheet("background-color: rgba(255, 255, 255, 0);"
+                                 "color: rgb(189, 189, 189);")
+        self.label_font_dirty = True
+
+        # Session recording: while a Recorder is set, every handled key press is logged with the
+        # design state it resulted in, so the performance can be re-rendered with line_art.recording
+        self.recorder = None
+
+        # Video streaming: while an EncoderStream is set, the show is piped into ffmpeg at the video's
+        # frame rate, dropping frames rather than waiting whenever the encoder falls behind. The stream
+        # has its own timer, which keeps running while the design is paused, and writes the newest frame
+        # drawn on each tick or the last one again when nothing new was drawn.
+        self.encoder_stream = None
+        self.stream_renderer = None
+        self.stream_drawn = None
+        self.stream_frames = 0
+        self.stream_elapsed = QElapsedTimer()
+        self.stream_timer = QTimer(self)
+        self.stream_timer.setTimerType(Qt.PreciseTimer)
+        self.stream_timer.setInterval(max(int(1000 / self.target_fps), 1))
+        self.stream_timer.timeout.connect(self.write_stream_frames)
+
+        # Presets, bound to F1-F12. The bank is loaded once the first frame is on screen, everything
+        # each preset needs is warmed up then, and a switch only happens once its preset is warm.
+        self.presets = []
+        self.preset_warmer = None
+        self.pending_preset = None
+        self.preset_timer = QTimer(self)
+        self.preset_timer.setInterval(5)
+        self.preset_timer.timeout.connect(self.finish_preset_switch)
 
         # Create a counter for counting "frames" of the design
         self.count = 0
+        self.rect_total = 0
+
+        # What the last frame's culling dropped (a CullStats), for the HUD and profiles
+        self.cull_stats = None
+
+        # Frame-time profiling, always recorded and shown on demand in a HUD overlay
+        self.profiler = FrameProfiler()
+        self.profile_view_painting()
+        self.show_hud = False
+        self.hud_label = QLabel(self)
+        self.hud_label.setFont(QFont("Monospace", 9))
+        self.hud_label.setStyleSheet("background-color: rgba(0, 0, 0, 120);"
+                                     "color: rgb(189, 189, 189);")
+        self.hud_label.setGeometry(10, 10, 430, 180)
+        self.hud_label.hide()
+
+        # Create the animation clock. It only runs while the design is moving.
+        self.clock = AnimationClock(self.advance_design, self.render_frame,
+                                    self.target_fps, self.simulation_rate, self)
+
+        self.apply_detail_level()
+        self.render_frame()
 
     def set_children_focus_policy(self, policy):
         """A method to overide default properties of key presses."""
@@ -210,44 +399,547 @@ class ArtInvention(QWidget):
             idx = 0
         return list[idx]
 
-    def get_op(self, operator, a, b):
-        if operator == '+':
-            return a + b
-        elif operator == '-':
-            return a - b
-        elif operator == '*':
-            return a * b
-        elif operator == '/':
-            return a / b
-
     def paintEvent(self, event):
         """A method to setup the paint event."""
 
-        self.draw_background()
-        self.get_design_colors()
-        self.display_stats()
-
-        if self.allow_image_movement:
+        with self.profiler.stage('paint'):
             canvas_painter = QPainter()
             canvas_painter.begin(self)
+            # A painter backend image rendered below full scale is upscaled with smooth filtering
+            canvas_painter.setRenderHint(QPainter.SmoothPixmapTransform)
             canvas_painter.drawImage(self.rect(), self.image, self.image.rect())
+            canvas_painter.end()
+
+    def render_frame(self):
+        """A method to draw the current state of the design into the scene, called by the clock."""
+
+        # The previous frame's record is complete (including its paint) until the next one begins
+        if self.allow_image_movement and self.profiler.current is not None:
+            if self.lod.record(self.profiler.current.total_ms()):
+                self.apply_detail_level()
+
+        self.profiler.begin_frame()
 
-            self.draw_design()
+        with self.profiler.stage('background'):
+            self.draw_background()
+        with self.profiler.stage('colors'):
+            self.get_design_colors()
+        with self.profiler.stage('stats'):
+            self.display_stats()
 
+        if self.allow_image_movement:
+            with self.profiler.stage('design'):
+                self.draw_current_design(wait=False)
             self.count += 1
+            self.paused_params = None
+
+        self.scene.setSceneRect(0, 0, self.image_width, self.image_width)
+
+        culled = self.cull_stats.culled if self.cull_stats is not None else 0
+        self.profiler.set_counts(self.rect_total, len(self.item_pool) + len(self.row_pool) + 1, culled)
+        if self.show_hud and self.count % 15 == 0:
+            self.hud_label.setText(self.hud_text())
+
+    def profile_view_painting(self):
+        """A method to time the graphics view's own painting as the 'paint' stage of a frame."""
+        view_paint_event = self.graphicsView.paintEvent
+
+        def profiled_paint_event(event):
+            with self.profiler.stage('paint'):
+                view_paint_event(event)
+            if not self.startup_timer.done('first frame'):
+                self.finish_startup()
+
+        self.graphicsView.paintEvent = profiled_paint_event
+
+    def finish_startup(self):
+        """A method to mark the first frame on screen, printing the startup report if it was asked for."""
+        self.startup_timer.mark('first frame')
+        if self.startup_report:
+            print(self.startup_timer.report(), file=sys.stderr)
+        QTimer.singleShot(0, self.load_preset_bank)
+        if self.quit_after_startup:
+            QTimer.singleShot(0, QApplication.instance().quit)
+
+    def toggle_hud(self):
+        """A method to show or hide the frame-time HUD."""
+        self.show_hud = not self.show_hud
+        self.hud_label.setText(self.hud_text())
+        self.hud_label.setVisible(self.show_hud)
+
+    def hud_text(self):
+        """A method to return the HUD text: the frame timings, the clock's dropped frames and the current level of detail."""
+        return (self.profiler.hud_text() + "\n" + self.clock.stats_text() + "\n" + self.lod.hud_text() + "\n"
+                + self.frame_cache.stats_text()
+                + "\n" + self.timeline.model.stats_text())
+
+    def apply_detail_level(self):
+        """A method to apply the antialiasing of the current level of detail to both backends.
+
+        The level's rectangle thinning and line thickness are read when the frame is drawn.
+        """
+        antialias = self.antialias and self.lod.level.antialias
+        self.graphicsView.setRenderHint(QPainter.Antialiasing, antialias)
+        if self.painter_renderer is not None:
+            self.painter_renderer.antialias = antialias
+            self.painter_renderer.set_scale(self.effective_render_scale())
+            self.image = self.painter_renderer.image
+
+    def effective_render_scale(self):
+        """A method to return the painter backend's render scale: the set scale, lowered by the level of detail."""
+        return self.render_scale * self.lod.level.render_scale
+
+    def render_scale_text(self):
+        """A method to return the render scale as shown in the controls label."""
+        text = f"{round(self.render_scale * 100)}%"
+        if self.render_backend != 'Painter':
+            text += " (Painter backend only)"
+        return text
+
+    def change_render_scale(self, step):
+        """A method to move the render scale step places down (1) or up (-1) the list of scales."""
+        index = self.render_scales.index(self.render_scale) + step
+        self.render_scale = self.render_scales[min(max(index, 0), len(self.render_scales) - 1)]
+        self.display_dict['17_render_scale']['state'] = self.render_scale_text()
+        self.apply_detail_level()
+
+    def toggle_adaptive_detail(self):
+        """A method to switch adaptive level of detail on or off."""
+        self.lod.toggle()
+        self.display_dict['13_adaptive_lod']['state'] = 'On' if self.lod.enabled else 'Off'
+        self.apply_detail_level()
+
+    def toggle_recording(self):
+        """A method to start recording the session to recordings/, or stop the current recording.
+
+        The state at the start is logged as an event with no key, and the state at the end with the U key,
+        so a replay covers the whole recording.
+        """
+        if self.recorder is None:
+            recording_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recordings')
+            os.makedirs(recording_dir, exist_ok=True)
+            name = time.strftime("session_%Y%m%d_%H%M%S.lartrec")
+            from line_art.recording import Recorder
+
+            self.recorder = Recorder(os.path.join(recording_dir, name), self.image_width, self.height())
+            self.recorder.record(0, self.design_params())
+            self.display_dict['14_recording']['state'] = name
+        else:
+            self.recorder.record(Qt.Key_U, self.design_params())
+            self.recorder.close()
+            self.recorder = None
+            self.display_dict['14_recording']['state'] = 'Off'
+
+    def toggle_video_stream(self):
+        """A method to start streaming the show into a video in recordings/, or stop the current stream."""
+        if self.encoder_stream is not None:
+            self.stop_video_stream()
+            return
+        from line_art.encode import EncoderStream, encoder_command
+
+        recording_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recordings')
+        os.makedirs(recording_dir, exist_ok=True)
+        name = time.strftime("show_%Y%m%d_%H%M%S.mp4")
+        # The encoder's 4:2:0 chroma needs even dimensions
+        width = self.image_width - self.image_width % 2
+        height = self.height() - self.height() % 2
+        try:
+            self.encoder_stream = EncoderStream(
+                encoder_command(os.path.join(recording_dir, name), width, height, self.target_fps), width, height)
+        except OSError as error:
+            print(f"Could not start the encoder: {error}", file=sys.stderr)
+            self.display_dict['18_video_stream']['state'] = 'ffmpeg not found'
+            return
+        self.stream_renderer = OffscreenRenderer(width, height, self.gradients, self.antialias,
+                                                 self.bg_stripe_count, self.frame_cache)
+        self.display_dict['18_video_stream']['state'] = name
+
+        column_stride = self.lod.level.column_stride
+        self.stream_drawn = (self.timeline.frame(self.design_params(), column_stride), column_stride,
+                             self.stream_params())
+        self.stream_frames = 0
+        self.stream_elapsed.start()
+        self.stream_timer.start()
+        self.write_stream_frames()
+
+    def stop_video_stream(self, state='Off'):
+        """A method to finish the video stream, printing its throughput."""
+        stream = self.encoder_stream
+        self.encoder_stream = None
+        self.stream_renderer = None
+        self.stream_drawn = None
+        self.stream_timer.stop()
+        try:
+            stream.close()
+        except RuntimeError as error:
+            print(error, file=sys.stderr)
+            state = 'Encoder failed'
+        print(stream.report(), file=sys.stderr)
+        self.display_dict['18_video_stream']['state'] = state
+
+    def stream_params(self):
+        """A method to return the design's parameters as they are drawn, with the detail level's line thickness."""
+        params = self.design_params()
+        return params.copy(line_thickness=self.lod.level.line_thickness(params.line_thickness))
+
+    def write_stream_frames(self):
+        """A method run by the stream timer to write every frame of the video due by now.
+
+        Frames are due at the video's frame rate in wall-clock time, so pauses and late ticks last as
+        long in the video as they did on screen: the newest frame drawn is painted into the stream, and
+        the last frame is repeated for the rest. The show never waits for the encoder. While it is
+        behind, the newest frame waits for a free buffer, and frames it has no room for are dropped.
+        """
+        due = int(self.stream_elapsed.elapsed() * self.target_fps / 1000) + 1 - self.stream_frames
+        try:
+            for _ in range(max(due, 0)):
+                paint = self.paint_stream_frame if self.stream_drawn is not None else None
+                if self.encoder_stream.offer(paint):
+                    self.stream_drawn = None
+                self.stream_frames += 1
+        except OSError as error:
+            print(error, file=sys.stderr)
+            self.stop_video_stream('Encoder failed')
+            if not self.clock.is_running():
+                self.display_stats()
+
+    def paint_stream_frame(self, image):
+        """A method to paint the newest frame drawn into an image of the video stream, just as it is shown."""
+        frame, column_stride, params = self.stream_drawn
+        self.stream_renderer.use_image(image)
+        self.stream_renderer.render(params, column_stride, frame)
+
+    def load_preset_bank(self):
+        """A method to load the preset bank from presets.json and start warming it up."""
+        from line_art.presets import PresetWarmer, load_presets
+
+        self.presets = load_presets(gradients=self.gradients)
+        self.preset_warmer = PresetWarmer(self.image_width)
+        self.warm_presets()
+
+    def warm_presets(self):
+        """A method to warm up every preset of the bank ahead of its switch.
+
+        The geometry is evaluated on the preset warmer's thread, while the pens and enough spare scene
+        items for the largest preset are created here, on the GUI thread, where they have to be.
+        """
+        slot_count = 0
+        for preset in self.presets:
+            if preset is None:
+                continue
+            params = preset.params
+            self.preset_warmer.warm(params)
+            pen_table(find_gradient(self.gradients, params.palette), params.rect_count,
+                      self.lod.level.line_thickness(params.line_thickness))
+            slot_count = max(slot_count, len(design_slots(params.rect_count, self.image_width)[0]))
+        self.item_pool.reserve(slot_count)
+
+    def switch_preset(self, index):
+        """A method to start switching to a preset. The switch happens once the preset is warm."""
+        if index >= len(self.presets) or self.presets[index] is None:
+            return
+
+        preset = self.presets[index]
+        params = preset.applied_to(self.design_params())
+        self.pending_preset = (preset, params, self.preset_warmer.warm(params))
+        self.display_dict['16_preset']['state'] = f"{preset.name} (warming up)"
+        self.preset_timer.start()
+
+    def finish_preset_switch(self):
+        """A method polled by the preset timer to apply a pending preset once its geometry is warm.
+
+        The pens and the scene items the preset needs were created when the bank was loaded. They are
+        looked up again here, which only creates them if the level of detail has changed the pens.
+        """
+        if self.pending_preset is None:
+            self.preset_timer.stop()
+            return
+        preset, params, warmed = self.pending_preset
+        if not warmed.done():
+            return
+        warmed.result()
+        self.pending_preset = None
+        self.preset_timer.stop()
+
+        gradient = find_gradient(self.gradients, params.palette)
+        pen_table(gradient, params.rect_count, self.lod.level.line_thickness(params.line_thickness))
+        if self.render_backend in ('Scene', 'OpenGL'):
+            self.item_pool.reserve(len(design_slots(params.rect_count, self.image_width)[0]))
+
+        self.apply_params(params)
+        self.geometry_worker.invalidate()
+        self.display_dict['16_preset']['state'] = preset.name
+        if self.recorder is not None:
+            self.recorder.record(0, self.design_params())
+        self.redraw_paused()
+        if not self.clock.is_running():
+            self.display_stats()
+
+    def save_preset(self, index):
+        """A method to save the current design into a preset slot and write presets.json.
+
+        Slots past the end of the bank are saved to the next free slot. A design that draws nothing
+        is not saved, since it would be skipped when the bank is loaded. Nothing is saved before the
+        bank is loaded, which would overwrite it.
+        """
+        if self.preset_warmer is None:
+            return
+        from line_art.presets import Preset, check_preset, save_presets
+
+        params = self.design_params()
+        if index < len(self.presets) and self.presets[index] is not None:
+            preset = Preset(self.presets[index].name, params)
+        elif index < len(self.presets):
+            preset = Preset(f"Preset {index + 1}", params)
+        else:
+            index = len(self.presets)
+            preset = Preset(f"Preset {index + 1}", params)
+        try:
+            check_preset(preset, self.gradients)
+        except ValueError:
+            self.display_dict['16_preset']['state'] = "Nothing visible, not saved"
+            return
+        self.presets[index:index + 1] = [preset]
+        save_presets(self.presets)
+        self.display_dict['16_preset']['state'] = f"{self.presets[index].name} saved to F{index + 1}"
+
+    def apply_params(self, params):
+        """A method to take on the design values of a DesignParams, keeping the starting point and direction."""
+        self.speed = params.speed
+        self.rect_width = params.rect_width
+        self.rect_count = params.rect_count
+        self.prox_to_center = params.prox_to_center
+        self.line_thickness = params.line_thickness
+        self.op_list = list(params.op_list)
+        self.trig_list = [self.trig_by_name[name] for name in params.trig_names]
+        self.gradient_index = [gradient.name for gradient in self.gradients].index(params.palette)
+
+        if self.speed > 0.001:
+            self.display_dict['01_speed']['state'] = str(float("{:.1f}".format(self.speed * 100)))
+        else:
+            self.display_dict['01_speed']['state'] = str(float("{:.3f}".format(self.speed * 100)))
+        self.display_dict['02_rect_width']['state'] = str("{:.1f}".format(float(self.rect_width)))
+        self.display_dict['03_rect_count']['state'] = str(self.rect_count)
+        self.display_dict['04_prox_to_center']['state'] = str(self.prox_to_center)
+        self.display_dict['05_line_thickness']['state'] = str(self.line_thickness)
+        for index, op in enumerate(self.op_list):
+            field, first = ('06_op_list_00', 0) if index < 4 else ('07_op_list_01', 4)
+            self.display_dict[field][f"state_{index - first:02d}"] = self.operator_update(op)
+        for index, trig in enumerate(self.trig_list):
+            field, first = ('08_trig_00', 0) if index < 4 else ('09_trig_01', 4) if index < 8 else ('10_trig_02', 8)
+            self.display_dict[field][f"state_{index - first:02d}"] = self.trig_update(trig)
+        self.display_dict['11_palette']['state'] = params.palette
+
+    def export_profile(self):
+        """A method to write the buffered frame timings to profiles/ as CSV and Chrome trace JSON."""
+        profile_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+        os.makedirs(profile_dir, exist_ok=True)
+        name = time.strftime("frame_profile_%Y%m%d_%H%M%S")
+        self.profiler.export_csv(os.path.join(profile_dir, name + '.csv'))
+        self.profiler.export_chrome_trace(os.path.join(profile_dir, name + '.json'))
+
+    def draw_current_design(self, wait=True):
+        """A method to draw the design with the active render backend.
+
+        With wait=False the geometry comes from the worker thread, and when nothing newer is ready
+        the frame on screen is kept.
+        """
+        column_stride = self.lod.level.column_stride
+        frame = self.next_frame(column_stride, wait)
+        if frame is None:
+            return
+
+        if self.render_backend == 'Painter':
+            self.paint_design(frame, column_stride)
+        else:
+            # Outside of render_frame the pens may still be those of the previous rect_count
+            if wait:
+                self.get_design_colors()
+            self.draw_design(frame, column_stride)
+
+        if self.encoder_stream is not None:
+            self.stream_drawn = (frame, column_stride, self.stream_params())
+
+    def next_frame(self, column_stride, wait):
+        """A method to return the geometry of the current design, or None if it is not ready.
+
+        Unless wait is True, the frame is only looked up: in the frame cache, or else the newest one
+        handed back by the geometry worker, which may be a step or two behind. The worker is then
+        set to the frame expected at the next tick.
+        """
+        params = self.design_params()
+        if wait:
+            return self.timeline.frame(params, column_stride)
+
+        result = self.geometry_worker.take()
+        if result is not None:
+            self.frame_cache.put(result.params, result.image_width, result.column_stride, result.frame)
+
+        frame = self.frame_cache.get(params, self.image_width, column_stride)
+        if frame is None and result is not None and result.column_stride == column_stride:
+            frame = result.frame
+
+        if not self.geometry_worker.busy():
+            upcoming = params.copy(starting_point=params.point_after(self.simulation_rate / self.target_fps))
+            if not self.frame_cache.has(upcoming, self.image_width, column_stride):
+                self.geometry_worker.submit(upcoming, self.image_width, column_stride)
+        return frame
+
+    def redraw_paused(self):
+        """A method to show a key press's changes while the design is paused.
+
+        The frame model only recomputes the outputs the changed parameters feed, and the item pools
+        only touch the items whose rectangles or pens changed. Unchanged parameters redraw nothing.
+        """
+        if self.allow_image_movement or not self.design_shown:
+            return
+        params = self.design_params()
+        if params == self.paused_params:
+            return
+        self.paused_params = params
+        self.draw_current_design()
+
+    def paint_design(self, frame, column_stride):
+        """A method to paint the design straight onto the window image, bypassing the scene."""
+        params = self.design_params()
+        params = params.copy(line_thickness=self.lod.level.line_thickness(params.line_thickness))
+        self.painter_renderer.render(params, column_stride, frame)
+        self.rect_total = self.painter_renderer.last_rect_count
+        self.cull_stats = self.painter_renderer.last_cull_stats
+        self.design_shown = True
+        self.update()
+
+    def switch_render_backend(self):
+        """A method to switch to the next render backend, skipping OpenGL where it cannot run."""
+        render_backend = self.next_val(self.render_backends, self.render_backend)
+        if render_backend == 'OpenGL' and not self.opengl_usable():
+            render_backend = self.next_val(self.render_backends, self.render_backend)
+        self.set_render_backend(render_backend)
+
+    def opengl_usable(self):
+        """A method to return whether the OpenGL backend can run, dropping it from the backends if not.
+
+        Checking takes creating an OpenGL context, so it is left until the backend is first asked for.
+        """
+        from line_art.viewport import opengl_available
+
+        if not opengl_available() and 'OpenGL' in self.render_backends:
+            self.render_backends.remove('OpenGL')
+        return 'OpenGL' in self.render_backends
+
+    def set_render_backend(self, render_backend):
+        """A method to switch to a render backend, redrawing the current design."""
+        self.render_backend = render_backend
+        self.display_dict['12_render_backend']['state'] = self.render_backend
+        self.display_dict['17_render_scale']['state'] = self.render_scale_text()
+
+        # Only the painter backend can lower its resolution, so only it gets the resolution levels
+        self.lod.levels = levels_for(self.antialias, self.render_backend == 'Painter')
+        self.lod.reset()
+
+        # Only the active backend's scene items are kept
+        if self.render_backend != 'Instanced':
+            self.row_pool.clear()
+        if self.render_backend not in ('Scene', 'OpenGL'):
+            self.item_pool.clear()
+
+        if self.render_backend == 'Painter':
+            self.graphicsView.hide()
+            self.painter_renderer = OffscreenRenderer(self.image_width, self.height(), self.gradients,
+                                                      self.antialias and self.lod.level.antialias,
+                                                      self.bg_stripe_count, self.frame_cache,
+                                                      self.effective_render_scale())
+            self.image = self.painter_renderer.image
+        else:
+            if self.render_backend == 'OpenGL':
+                from line_art.viewport import use_opengl_viewport
 
-            self.scene.update()
+                use_opengl_viewport(self.graphicsView, self.antialias)
+            else:
+                use_raster_viewport(self.graphicsView)
+            self.graphicsView.show()
+            self.painter_renderer = None
+            self.image = QImage(self.size(), QImage.Format_RGB32)
+
+        self.draw_current_design()
+
+    def advance_design(self, steps):
+        """A method to move the starting point by a number of fixed simulation steps.
+
+        Inside a ping-pong loop the direction reverses at either end of the loop.
+        """
+        if not (self.forward_true or self.backward_true):
+            return
+
+        direction = FORWARD if self.forward_true else BACKWARD
+        self.starting_point, new_direction = self.timeline.move(
+            self.starting_point, steps * self.row_steps_per_step * self.speed, direction)
+        if new_direction == direction:
+            return
+        self.geometry_worker.invalidate()
+        if new_direction == FORWARD:
+            self.forward()
+        else:
+            self.backward()
 
-            if self.count % 2 == 0:
-                self.scene.clear()
-                self.draw_design()
+        # The reversal is not a key press, but a replay of the session has to see it
+        if self.recorder is not None:
+            self.recorder.record(0, self.design_params())
+
+    def toggle_loop(self):
+        """A method to mark the first end of a ping-pong loop, then the second, then clear the loop."""
+        if self.timeline.loop is not None:
+            self.timeline.loop = None
+            self.display_dict['15_loop']['state'] = 'Off'
+        elif self.loop_mark is None:
+            self.loop_mark = self.starting_point
+            self.display_dict['15_loop']['state'] = f"From {self.loop_mark:.2f}, press J again to close"
+        else:
+            self.timeline.loop = PingPongLoop(self.loop_mark, self.starting_point)
+            self.loop_mark = None
+            self.display_dict['15_loop']['state'] = f"{self.timeline.loop.low:.2f} to {self.timeline.loop.high:.2f}"
+
+    def seek(self, seconds):
+        """A method to move the starting point by a number of seconds of forward animation and redraw it."""
+        self.starting_point, direction = self.timeline.move(
+            self.starting_point, seconds * self.simulation_rate * self.row_steps_per_step * self.speed, FORWARD)
+        self.draw_current_design()
+
+    def design_params(self):
+        """A method to capture the current design state as a DesignParams."""
+        if self.forward_true:
+            direction = FORWARD
+        elif self.backward_true:
+            direction = BACKWARD
+        else:
+            direction = PAUSED
 
-            self.scene.setSceneRect(0, 0, self.image_width, self.image_width)
+        return DesignParams(self.starting_point, self.speed, self.rect_width, self.rect_count,
+                            self.prox_to_center, self.line_thickness, self.op_list,
+                            [self.trig_update(trig) for trig in self.trig_list],
+                            self.gradients[self.gradient_index].name, direction)
 
-            canvas_painter.end()
+    def update_clock(self):
+        """A method to run the animation clock only while the design is moving."""
+        if self.allow_image_movement:
+            self.clock.start()
+        else:
+            self.clock.stop()
 
     def display_stats(self):
-        """A method to display info in the GUI."""
+        """A method to display info in the GUI.
+
+        Called once per frame; the font and text are only applied to the label when they changed.
+        """
+
+        if self.label_font_dirty:
+            self.label_font_dirty = False
+            self.label.setFont(self.label_fonts[self.label_font_size_index])
+            self.label.setGeometry(10, self.window_height - self.label_font_size[0][self.label_font_size_index][1],
+                                   750, self.label_font_size[0][self.label_font_size_index][2])
+
+        if not self.controls.take_dirty():
+            return
 
         label_00 = self.display_dict['00_direction']['controls'] + "   - " + \
                    self.display_dict['00_direction']['name'] + ": " + \
@@ -310,6 +1002,38 @@ class ArtInvention(QWidget):
                    self.display_dict['10_trig_02']['state_03'] + ", " + \
                    self.display_dict['10_trig_02']['state_04']
 
+        label_11 = self.display_dict['11_palette']['controls'] + "             -  " + \
+                   self.display_dict['11_palette']['name'] + ": " + \
+                   self.display_dict['11_palette']['state']
+
+        label_12 = self.display_dict['12_render_backend']['controls'] + "              -  " + \
+                   self.display_dict['12_render_backend']['name'] + ": " + \
+                   self.display_dict['12_render_backend']['state']
+
+        label_13 = self.display_dict['13_adaptive_lod']['controls'] + "              -  " + \
+                   self.display_dict['13_adaptive_lod']['name'] + ": " + \
+                   self.display_dict['13_adaptive_lod']['state']
+
+        label_14 = self.display_dict['14_recording']['controls'] + "             -  " + \
+                   self.display_dict['14_recording']['name'] + ": " + \
+                   self.display_dict['14_recording']['state']
+
+        label_15 = self.display_dict['15_loop']['controls'] + "              -  " + \
+                   self.display_dict['15_loop']['name'] + ": " + \
+                   self.display_dict['15_loop']['state']
+
+        label_16 = self.display_dict['16_preset']['controls'] + "      -  " + \
+                   self.display_dict['16_preset']['name'] + ": " + \
+                   self.display_dict['16_preset']['state']
+
+        label_17 = self.display_dict['17_render_scale']['controls'] + "        -  " + \
+                   self.display_dict['17_render_scale']['name'] + ": " + \
+                   self.display_dict['17_render_scale']['state']
+
+        label_18 = self.display_dict['18_video_stream']['controls'] + "             -  " + \
+                   self.display_dict['18_video_stream']['name'] + ": " + \
+                   self.display_dict['18_video_stream']['state']
+
         self.label.setText(label_00 + "\n" +
                            label_01 + "\n" +
                            label_02 + "\n" +
@@ -320,18 +1044,22 @@ class ArtInvention(QWidget):
                            label_07 + "\n" +
                            label_08 + "\n" +
                            label_09 + "\n" +
-                           label_10)
-
-        self.label.setStyleSheet(f"font: {self.label_font_size[0][self.label_font_size_index][0]}pt MS Shell Dlg 2;"
-                                 "background-color: rgba(255, 255, 255, 0);"
-                                 "color: rgb(189, 189, 189);")
-
-        self.label.setGeometry(10, self.window_height - self.label_font_size[0][self.label_font_size_index][1],
-                               750, self.label_font_size[0][self.label_font_size_index][2])
+                           label_10 + "\n" +
+                           label_11 + "\n" +
+                           label_12 + "\n" +
+                           label_13 + "\n" +
+                           label_14 + "\n" +
+                           label_15 + "\n" +
+                           label_16 + "\n" +
+                           label_17 + "\n" +
+                           label_18)
 
     def keyPressEvent(self, QKeyEvent):
         """A method to assign functions to key presses."""
 
+        # Geometry already being evaluated for the old settings is not shown
+        self.geometry_worker.invalidate()
+
         # Assigns the keys to move the design forward or backward
         if QKeyEvent.key() == Qt.Key_Right:
             self.forward()
@@ -381,6 +1109,47 @@ class ArtInvention(QWidget):
         elif QKeyEvent.key() == Qt.Key_Shift:
             self.label_font_size_adjust()
 
+        # Assigns the key to cycle the color palette
+        elif QKeyEvent.key() == Qt.Key_P:
+            self.next_palette()
+
+        # Assigns the key to switch the render backend
+        elif QKeyEvent.key() == Qt.Key_I:
+            self.switch_render_backend()
+
+        # Assigns the keys to show the frame-time HUD and export the frame timings
+        elif QKeyEvent.key() == Qt.Key_O:
+            self.toggle_hud()
+        elif QKeyEvent.key() == Qt.Key_K:
+            self.export_profile()
+
+        # Assigns the key to switch adaptive level of detail
+        elif QKeyEvent.key() == Qt.Key_L:
+            self.toggle_adaptive_detail()
+
+        # Assigns the function keys to switch presets, or to save them while Ctrl is held
+        elif Qt.Key_F1 <= QKeyEvent.key() <= Qt.Key_F12:
+            if QKeyEvent.modifiers() & Qt.ControlModifier:
+                self.save_preset(QKeyEvent.key() - Qt.Key_F1)
+            else:
+                self.switch_preset(QKeyEvent.key() - Qt.Key_F1)
+
+        # Assigns the keys to loop and seek through the design
+        elif QKeyEvent.key() == Qt.Key_J:
+            self.toggle_loop()
+        elif QKeyEvent.key() == Qt.Key_Comma:
+            self.seek(-1)
+        elif QKeyEvent.key() == Qt.Key_Period:
+            self.seek(1)
+
+        # Assigns the key to start or stop recording the session
+        elif QKeyEvent.key() == Qt.Key_U:
+            self.toggle_recording()
+
+        # Assigns the key to start and stop streaming the show into a video
+        elif QKeyEvent.key() == Qt.Key_0:
+            self.toggle_video_stream()
+
         # Assigns the keys to adjust trigonometric functions
         elif QKeyEvent.key() == Qt.Key_E:
             self.trig_list[0] = self.next_val(self.trig_options, self.trig_list[0])
@@ -453,6 +1222,23 @@ class ArtInvention(QWidget):
         elif QKeyEvent.key() == Qt.Key_Delete:
             self.hard_reset()
 
+        # Assigns the keys to lower and raise the render scale
+        elif QKeyEvent.key() == Qt.Key_Minus:
+            self.change_render_scale(1)
+        elif QKeyEvent.key() == Qt.Key_Equal:
+            self.change_render_scale(-1)
+
+        self.redraw_paused()
+
+        # U logs its own events when it starts and stops a recording
+        if self.recorder is not None and QKeyEvent.key() != Qt.Key_U:
+            self.recorder.record(QKeyEvent.key(), self.design_params())
+
+        # While the clock runs the label is refreshed with the next frame
+        self.update_clock()
+        if not self.clock.is_running():
+            self.display_stats()
+
     def forward(self):
         """A method to have the image move forward."""
         if not self.forward_true:
@@ -578,6 +1364,12 @@ class ArtInvention(QWidget):
             self.label_font_size_index = 0
         else:
             self.label_font_size_index += 1
+        self.label_font_dirty = True
+
+    def next_palette(self):
+        """A method to switch to the next color palette."""
+        self.gradient_index = (self.gradient_index + 1) % len(self.gradients)
+        self.display_dict['11_palette']['state'] = self.gradients[self.gradient_index].name
 
     def trig_update(self, trig_list_item):
         """A method to update the trigonometric functions in the display."""
@@ -615,8 +1407,13 @@ class ArtInvention(QWidget):
     def hard_reset(self):
         """A method to hard reset all variables variables."""
 
-        # Clear scene
-        self.scene.clear()
+        # Clear the design from the scene, or from the painted image
+        self.item_pool.clear()
+        self.row_pool.clear()
+        self.design_shown = False
+        if self.painter_renderer is not None:
+            self.painter_renderer.render_background()
+            self.update()
 
         # Reset movements
         self.allow_image_movement = False
@@ -630,6 +1427,11 @@ class ArtInvention(QWidget):
         self.rect_count = self.reset_list[3]
         self.prox_to_center = self.reset_list[4]
         self.line_thickness = self.reset_list[5]
+        self.gradient_index = 0
+        self.lod.reset()
+        self.apply_detail_level()
+        self.timeline.loop = None
+        self.loop_mark = None
 
         self.trig_list = [float, float, float, float,
                           float, float, float, float,
@@ -669,108 +1471,56 @@ class ArtInvention(QWidget):
         self.display_dict['10_trig_02']['state_03'] = 'None'
         self.display_dict['10_trig_02']['state_04'] = 'None'
 
-    def draw_background(self):
-        """A method to draw the background."""
+        # Reset palette display stats
+        self.display_dict['11_palette']['state'] = self.gradients[self.gradient_index].name
+        self.display_dict['15_loop']['state'] = 'Off'
 
-        pen = QPen(QColor(0, 0, 0), 1, )
+    def draw_background(self):
+        """A method to draw the background.
 
-        grad = QLinearGradient(QPoint(self.image_width, 0), QPoint(self.image_width, self.image_width))
+        The gradient brush and the outline rectangle are only rebuilt when the image width or the
+        stripe count changes, so drawing the background every frame adds nothing to the scene.
+        """
 
-        bg_start_colors = [30, 5, 5]
-        bg_end_colors = [15, 5, 35]
+        background_key = (self.image_width, self.bg_stripe_count)
+        if background_key == self.background_key:
+            return
+        self.background_key = background_key
 
-        gradient_position = 0
-        grad_pos_inc = 1.0 / self.bg_stripe_count
-        for i in range(self.bg_stripe_count + 1):
-            grad.setColorAt(gradient_position if gradient_position <= 1 else 1,
-                            QColor(bg_start_colors[0], bg_start_colors[1], bg_start_colors[2]))
-            gradient_position += grad_pos_inc / 2
-            grad.setColorAt(gradient_position if gradient_position <= 1 else 1,
-                            QColor(bg_end_colors[0], bg_end_colors[1], bg_end_colors[2]))
-            gradient_position += grad_pos_inc / 2
+        pen = QPen(QColor(0, 0, 0), 1, )
 
         r = QRectF(QPointF(0, 0), QSizeF(self.image_width, self.image_width))
-        self.scene.setBackgroundBrush(grad)
-        self.scene.addRect(r, pen)
+        self.scene.setBackgroundBrush(background_brush(self.image_width, self.bg_stripe_count))
+        if self.background_item is None:
+            self.background_item = self.scene.addRect(r, pen)
+        else:
+            self.background_item.setRect(r)
 
     def get_design_colors(self):
-        """A method to declare the starting and ending colors, then create a list of colors."""
-
-        design_start_colors = [140, 255, 140]
-        design_end_colors = [5, 55, 140]
-
-        self.design_colors.append((design_start_colors[0], design_start_colors[1], design_start_colors[2]))
+        """A method to look up the row colors and pens of the current palette.
 
-        red_increment = (design_end_colors[0] - design_start_colors[0]) / self.rect_count
-        green_increment = (design_end_colors[1] - design_start_colors[1]) / self.rect_count
-        blue_increment = (design_end_colors[2] - design_start_colors[2]) / self.rect_count
+        Both tables are precomputed per (palette, rect_count, line_thickness) and shared by every
+        rectangle in a row, so this costs nothing unless one of those changed.
+        """
 
-        for i in range(self.rect_count):
-            design_start_colors[0] += red_increment
-            design_start_colors[1] += green_increment
-            design_start_colors[2] += blue_increment
-            self.design_colors.append(
-                (int(design_start_colors[0]), int(design_start_colors[1]), int(design_start_colors[2])))
+        gradient = self.gradients[self.gradient_index]
+        self.design_colors = color_table(gradient, self.rect_count)
+        self.design_pens = pen_table(gradient, self.rect_count, self.lod.level.line_thickness(self.line_thickness))
 
-    def draw_design(self):
+    def draw_design(self, frame, column_stride):
         """A method to draw a second design."""
 
-        for i in range(1, self.rect_count):
-            for j in range(i, self.image_width, int(self.image_width / self.rect_count)):
-                pen = QPen(QColor(self.design_colors[i][0], self.design_colors[i][1], self.design_colors[i][2]),
-                           self.line_thickness, Qt.SolidLine)
-
-                design = self.scene.addRect(
-                    # The starting x-value of the first rectangle
-                    self.get_op(self.op_list[1],
-                                self.trig_list[0](self.trig_list[1](
-                    self.get_op(self.op_list[0],
-                                self.image_half,
-                                self.trig_list[2](self.prox_to_center)))),
-                    self.get_op(self.op_list[2],
-                                self.trig_list[3](self.starting_point),
-                                self.trig_list[4](i))),
-
-                    # The starting y-value of the first rectangle
-                    self.get_op(self.op_list[4],
-                                self.trig_list[5](
-                    self.get_op(self.op_list[3],
-                                self.trig_list[6](self.image_half),
-                                self.trig_list[7](self.prox_to_center))),
-                                self.trig_list[8](self.starting_point)),
-
-                    # The x length of of the first rectangle
-                    self.get_op(self.op_list[5],
-                                self.trig_list[9](self.rect_width),
-                                self.trig_list[10](self.starting_point)),
-
-                    # The y length of of the first rectangle
-                    self.get_op(self.op_list[6],
-                                self.trig_list[11](self.rect_width),
-                                self.trig_list[12](self.starting_point)),
-                    pen)
-
-                """
-                Original, non-alterable code:
-                
-                design = self.scene.addRect(
-                    trig(trig(self.image_half / trig(self.prox_to_center)) - trig(self.starting_point) / trig(i)),
-                    trig(trig(self.image_half / trig(self.prox_to_center)) - trig(self.starting_point)),
-                    trig(self.rect_width + trig(self.starting_point)),
-                    trig(self.rect_width + trig(self.starting_point)),
-                    pen
-                """
-
-                transform = QTransform()
-                transform.translate(self.image_half, self.image_half / 2)
-                transform.rotate(round((i / j) * (360 / self.rect_count)))
-                transform.rotate((j * (360 / self.rect_count)))
-                design.setTransform(transform)
-
-            if self.forward_true:
-                self.starting_point += self.speed
-            elif self.backward_true:
-                self.starting_point -= self.speed
+        # Each row of the design is staggered by one speed step in the current direction
+        # At a reduced level of detail only some of each row's rectangles are drawn
+        self.rect_total = len(frame)
+        self.cull_stats = frame.cull_stats
+        self.design_shown = True
+
+        if self.render_backend == 'Instanced':
+            self.row_pool.update_frame(frame, self.design_pens, self.image_half)
+        else:
+            self.item_pool.update_frame(frame, self.design_pens, self.image_half,
+                                        (self.rect_count, self.image_width, column_stride))
 
         self.scene.update()
 
@@ -786,8 +1536,14 @@ class MyApplication(QApplication):
 
 if __name__ == '__main__':
     app = MyApplication(sys.argv)
+    startup_timer.mark('application')
     invention = ArtInvention()
+    invention.startup_report = '--startup-report' in sys.argv
+    invention.quit_after_startup = '--quit-after-startup' in sys.argv
+    if '--opengl' in sys.argv and invention.opengl_usable():
+        invention.set_render_backend('OpenGL')
     app.set_invention(invention)
     invention.show()
+    startup_timer.mark('window')
 
     sys.exit(app.exec())
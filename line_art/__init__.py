@@ -0,0 +1,3 @@
+# line_art - Helper modules for the New Line Art Designer.
+# The GUI itself lives in New-Line-Art-Designer.py; these modules hold the parts of
+# the design pipeline that are shared between the window and other entry points.
@@ -0,0 +1,237 @@
+# benchmark.py - Reproducible offscreen benchmarks over the design's parameter space.
+# For every combination of the swept parameters the geometry, the scene construction and the
+# rasterization are timed separately, and the results are written as a JSON report that can be
+# compared against a saved baseline to catch regressions:
+#
+#   python -m line_art.benchmark --out baseline.json
+#   python -m line_art.benchmark --out current.json --baseline baseline.json
+
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+
+from line_art.export import offscreen_app
+from line_art.params import DesignParams
+
+# Representative operator / trigonometry configurations
+PRESETS = {
+    'default': (('/', '-', '/', '/', '-', '+', '+'), ('None',) * 13),
+    'sine-wave': (('/', '-', '/', '/', '-', '+', '+'),
+                  ('None', 'None', 'None', 'Sine', 'None', 'None', 'None', 'None', 'Sine', 'None', 'Sine', 'None', 'Sine')),
+    'tangent-multiply': (('*', '-', '*', '*', '-', '*', '+'),
+                         ('None', 'Tangent', 'None', 'Tangent', 'Cosine', 'None', 'None', 'Sine', 'None', 'None', 'Cosine', 'None', 'None'))
+}
+
+METRICS = ('geometry_ms', 'scene_build_ms', 'scene_update_ms', 'scene_raster_ms', 'scene_gl_raster_ms',
+           'instanced_update_ms', 'instanced_raster_ms', 'painter_raster_ms')
+
+
+def timed(function, *args):
+    """A function to call function(*args) and return (milliseconds taken, result)."""
+    start = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def bench_case(params, image_width, frames):
+    """A function to time one parameter combination and return its median stage times in milliseconds."""
+    from PyQt5.QtCore import QRectF
+    from PyQt5.QtGui import QImage, QPainter
+    from PyQt5.QtWidgets import QGraphicsScene
+
+    from line_art.geometry import frame_for
+    from line_art.instancing import InstancedRowPool
+    from line_art.item_pool import RectItemPool
+    from line_art.palette import find_gradient, load_gradients, pen_table
+    from line_art.render import OffscreenRenderer, background_brush
+    from line_art.viewport import OffscreenGL, opengl_available
+
+    image_height = int(image_width * 9 / 16)
+    image_half = int(image_width / 2)
+    layout_key = (params.rect_count, image_width)
+    gradients = load_gradients()
+    pens = pen_table(find_gradient(gradients, params.palette), params.rect_count, params.line_thickness)
+
+    scene = QGraphicsScene()
+    scene.setSceneRect(0, 0, image_width, image_width)
+    scene.setBackgroundBrush(background_brush(image_width))
+    pool = RectItemPool(scene)
+    # The instanced backend draws the same frames with one path item per row, in a scene of its own
+    row_scene = QGraphicsScene()
+    row_scene.setSceneRect(0, 0, image_width, image_width)
+    row_scene.setBackgroundBrush(background_brush(image_width))
+    row_pool = InstancedRowPool(row_scene)
+    image = QImage(image_width, image_height, QImage.Format_RGB32)
+    view_rect = QRectF(0, (image_width - image_height) / 2, image_width, image_height)
+    renderer = OffscreenRenderer(image_width, image_height, gradients)
+    # The scene drawn by the paint engine of an OpenGL viewport, where a context can be created
+    gl_target = OffscreenGL(image_width, image_height) if opengl_available() else None
+
+    samples = {metric: [] for metric in METRICS}
+    fewest_drawn = None
+    for frame_index in range(frames):
+        frame_params = params.copy(starting_point=params.point_after(frame_index))
+
+        elapsed, frame = timed(frame_for, frame_params, image_width)
+        samples['geometry_ms'].append(elapsed)
+        fewest_drawn = len(frame) if fewest_drawn is None else min(fewest_drawn, len(frame))
+
+        # The first frame builds the item pool from nothing; later frames only update it
+        elapsed, result = timed(pool.update_frame, frame, pens, image_half, layout_key)
+        samples['scene_build_ms' if frame_index == 0 else 'scene_update_ms'].append(elapsed)
+
+        painter = QPainter(image)
+        elapsed, result = timed(scene.render, painter, QRectF(image.rect()), view_rect)
+        painter.end()
+        samples['scene_raster_ms'].append(elapsed)
+
+        if gl_target is not None:
+            elapsed, result = timed(gl_target.paint,
+                                    lambda gl_painter: scene.render(gl_painter, QRectF(image.rect()), view_rect))
+            samples['scene_gl_raster_ms'].append(elapsed)
+
+        elapsed, result = timed(row_pool.update_frame, frame, pens, image_half)
+        samples['instanced_update_ms'].append(elapsed)
+
+        painter = QPainter(image)
+        elapsed, result = timed(row_scene.render, painter, QRectF(image.rect()), view_rect)
+        painter.end()
+        samples['instanced_raster_ms'].append(elapsed)
+
+        # The geometry was timed above, so the painter is handed the same frame and times rasterization alone
+        elapsed, result = timed(renderer.render, frame_params, 1, frame)
+        samples['painter_raster_ms'].append(elapsed)
+
+    pool.clear()
+    row_pool.clear()
+    results = {metric: statistics.median(values) if values else 0.0 for metric, values in samples.items()}
+    if gl_target is None:
+        results['scene_gl_raster_ms'] = None
+    results['rect_count_drawn'] = len(frame)
+    # A frame culled to nothing would time only the background
+    results['fewest_rects_drawn'] = fewest_drawn
+    results['rect_count_culled'] = frame.cull_stats.culled
+    return results
+
+
+def run_benchmarks(rect_counts, rect_widths, line_thicknesses, image_widths, presets, frames):
+    """A function to run every combination of the swept parameters and return the report."""
+    # The application must stay referenced while scenes exist, or Qt tears it down under them
+    q_app = offscreen_app(widgets=True)
+    from PyQt5.QtCore import QT_VERSION_STR
+    import numpy
+
+    from line_art.viewport import opengl_available
+    if not opengl_available():
+        print("No OpenGL context could be created, so the OpenGL path is not timed", file=sys.stderr)
+
+    cases = []
+    for rect_count, rect_width, line_thickness, image_width, preset in itertools.product(
+            rect_counts, rect_widths, line_thicknesses, image_widths, presets):
+        op_list, trig_names = PRESETS[preset]
+        params = DesignParams(rect_width=rect_width, rect_count=rect_count, line_thickness=line_thickness,
+                              op_list=op_list, trig_names=trig_names)
+        case = {
+            'id': f"rc{rect_count}_w{rect_width}_t{line_thickness}_iw{image_width}_{preset}",
+            'rect_count': rect_count,
+            'rect_width': rect_width,
+            'line_thickness': line_thickness,
+            'image_width': image_width,
+            'preset': preset
+        }
+        case.update(bench_case(params, image_width, frames))
+        cases.append(case)
+        print(f"{case['id']:<44}" + "".join(f"{case[metric]:>18.2f}" if case[metric] is not None else f"{'-':>18}"
+                                            for metric in METRICS), file=sys.stderr)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'numpy': numpy.__version__,
+            'opengl': opengl_available(),
+            'platform': platform.platform(),
+            'frames': frames
+        },
+        'cases': cases
+    }
+
+
+def compare(report, baseline, tolerance, min_ms):
+    """A function to list the metrics that got slower than the baseline by more than the tolerance."""
+    baseline_cases = {case['id']: case for case in baseline['cases']}
+    regressions = []
+    for case in report['cases']:
+        base = baseline_cases.get(case['id'])
+        if base is None:
+            continue
+        for metric in METRICS:
+            if base.get(metric) is None or case[metric] is None:
+                continue
+            if case[metric] > base[metric] * (1 + tolerance) and case[metric] - base[metric] > min_ms:
+                regressions.append(f"{case['id']} {metric}: {base[metric]:.2f} ms -> {case[metric]:.2f} ms")
+    return regressions
+
+
+def int_list(text):
+    """A function to parse a comma separated list of integers."""
+    return [int(value) for value in text.split(',')]
+
+
+def positive_int(text):
+    """A function to parse an integer of at least 1."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the design offscreen over a parameter sweep.")
+    parser.add_argument('--rect-counts', type=int_list, default=[13, 40])
+    parser.add_argument('--rect-widths', type=int_list, default=[100, 400])
+    parser.add_argument('--line-thicknesses', type=int_list, default=[1, 4])
+    parser.add_argument('--image-widths', type=int_list, default=[1280, 1920])
+    parser.add_argument('--presets', type=lambda text: text.split(','), default=sorted(PRESETS),
+                        help=f"comma separated, from {', '.join(sorted(PRESETS))}")
+    parser.add_argument('--frames', type=positive_int, default=5, help="frames timed per combination")
+    parser.add_argument('--out', help="write the JSON report here (default: stdout)")
+    parser.add_argument('--baseline', help="JSON report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown as a fraction")
+    parser.add_argument('--min-ms', type=float, default=0.1, help="ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<44}" + "".join(f"{metric[:-3]:>18}" for metric in METRICS),
+          file=sys.stderr)
+    report = run_benchmarks(args.rect_counts, args.rect_widths, args.line_thicknesses, args.image_widths,
+                            args.presets, args.frames)
+
+    if args.out:
+        with open(args.out, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    empty = [case['id'] for case in report['cases'] if case['fewest_rects_drawn'] == 0]
+    for case_id in empty:
+        print(f"EMPTY: {case_id} culled every rectangle of a frame, so its times are not representative",
+              file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.tolerance, args.min_ms)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if not regressions:
+            print("No regressions against the baseline", file=sys.stderr)
+    if empty or regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
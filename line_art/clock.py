@@ -0,0 +1,80 @@
+# clock.py - A fixed-timestep animation clock.
+# The simulation advances in fixed steps measured against wall-clock time, while frames are drawn
+# at most once per timer tick. A late tick drops frames instead of slowing the animation down.
+
+from PyQt5.QtCore import QObject, QTimer, QElapsedTimer, Qt
+
+
+class AnimationClock(QObject):
+    """A class to drive the design's simulation and painting from a QTimer."""
+
+    def __init__(self, step_callback, frame_callback, target_fps=60, simulation_rate=60, parent=None):
+        """A method to set up the clock.
+
+        step_callback(steps) advances the simulation by a whole number of fixed steps and
+        frame_callback() draws the current state. Neither is called while the clock is stopped.
+        """
+        super(AnimationClock, self).__init__(parent)
+
+        self.step_callback = step_callback
+        self.frame_callback = frame_callback
+        self.simulation_step = 1000 / simulation_rate
+
+        self.elapsed = QElapsedTimer()
+        self.last_tick = 0.0
+        self.accumulator = 0.0
+        self.frames_drawn = 0
+        self.frames_dropped = 0
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        self.set_target_fps(target_fps)
+
+    def set_target_fps(self, target_fps):
+        """A method to change how often frames are drawn."""
+        self.target_fps = target_fps
+        self.frame_interval = 1000 / target_fps
+        self.timer.setInterval(max(int(self.frame_interval), 1))
+
+    def stats_text(self):
+        """A method to format the frames drawn and dropped since the clock was created, for the HUD."""
+        intervals = self.frames_drawn + self.frames_dropped
+        dropped = 100 * self.frames_dropped / intervals if intervals else 0.0
+        return (f"Clock {self.target_fps:g} fps  drawn {self.frames_drawn}"
+                f"  dropped {self.frames_dropped} ({dropped:.1f}%)")
+
+    def is_running(self):
+        return self.timer.isActive()
+
+    def start(self):
+        """A method to start the clock, measuring time from now."""
+        if not self.timer.isActive():
+            self.elapsed.start()
+            self.last_tick = 0.0
+            self.accumulator = 0.0
+            self.timer.start()
+
+    def stop(self):
+        """A method to stop the clock so nothing runs while the design is paused."""
+        self.timer.stop()
+
+    def tick(self):
+        """A method to catch the simulation up with wall-clock time, then draw one frame."""
+        now = self.elapsed.nsecsElapsed() / 1000000
+        delta = now - self.last_tick
+        self.last_tick = now
+
+        # Any frame intervals that passed without a tick are dropped, but their simulation steps are not
+        missed = int(delta / self.frame_interval) - 1
+        if missed > 0:
+            self.frames_dropped += missed
+
+        self.accumulator += delta
+        steps = int(self.accumulator / self.simulation_step)
+        self.accumulator -= steps * self.simulation_step
+
+        if steps:
+            self.step_callback(steps)
+        self.frame_callback()
+        self.frames_drawn += 1
@@ -0,0 +1,36 @@
+# controls.py - Observable state for the controls label.
+# The key handlers write into the display dictionary as before; every write that actually changes a
+# value marks the state dirty, so the label only has to be rebuilt on frames after something changed.
+
+
+class ObservableDict(dict):
+    """A class for a dictionary that reports changed values to a callback."""
+
+    def __init__(self, values, on_change):
+        super(ObservableDict, self).__init__(values)
+        self.on_change = on_change
+
+    def __setitem__(self, key, value):
+        if key in self and self[key] == value:
+            return
+        super(ObservableDict, self).__setitem__(key, value)
+        self.on_change(key)
+
+
+class ControlState:
+    """A class to hold the fields shown in the controls label and track whether any changed."""
+
+    def __init__(self, display_dict):
+        """A method to wrap each entry of a display dictionary so writes to it are observed."""
+        self.dirty = True
+        self.fields = {name: ObservableDict(entry, self.mark_dirty) for name, entry in display_dict.items()}
+
+    def mark_dirty(self, key=None):
+        """A method to flag that the label needs to be rebuilt."""
+        self.dirty = True
+
+    def take_dirty(self):
+        """A method to return whether anything changed since the last call, and reset the flag."""
+        dirty = self.dirty
+        self.dirty = False
+        return dirty
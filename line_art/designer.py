@@ -0,0 +1,16 @@
+# designer.py - Access to the GUI script from the helper tools.
+# New-Line-Art-Designer.py is a script rather than an importable module, so tools that drive the
+# window offscreen (such as the soak test) load it through runpy.
+
+import os
+import runpy
+from functools import lru_cache
+
+DESIGNER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'New-Line-Art-Designer.py')
+
+
+@lru_cache(maxsize=1)
+def load_designer():
+    """A function to load the GUI script once and return its namespace (ArtInvention, MyApplication, ...)."""
+    return runpy.run_path(DESIGNER_SCRIPT, run_name='line_art_designer')
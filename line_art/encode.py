@@ -0,0 +1,204 @@
+# encode.py - Streaming frames straight into a video encoder.
+# Rather than writing PNG frames to disk and encoding them afterwards, frames are painted into
+# preallocated images and piped, as raw BGRA video, into the stdin of an ffmpeg process. A writer
+# thread feeds the pipe while the next frame renders. The images go round between a queue of free
+# buffers and a bounded queue of rendered ones, so when the encoder falls behind, rendering waits for
+# a buffer to come back instead of frames piling up in memory, and no frame is ever allocated, copied
+# or converted on its way to the pipe:
+#
+#   python -m line_art.export --width 1920 --height 1080 --frames 0:600 --encode show.mp4
+#   python -m line_art.recording recordings/session_....lartrec --encode show.mp4
+#
+# The window streams the show the same way while 0 is toggled on, writing frames at the video's frame
+# rate in wall-clock time and repeating the last one whenever nothing new was drawn. A live show
+# cannot wait for the encoder, so there frames are offered without waiting, and dropped when the
+# encoder is too far behind.
+
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from PyQt5.QtGui import QImage
+
+# QImage.Format_RGB32 keeps each pixel as one 0xffRRGGBB word, which is B, G, R, A in memory on
+# little-endian machines
+RAW_PIXEL_FORMAT = 'bgra' if sys.byteorder == 'little' else 'argb'
+
+DEFAULT_CODEC_ARGS = ('-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p')
+
+# Queued in place of a buffer to write the last frame again
+REPEAT = object()
+
+
+def encoder_command(path, width, height, fps, ffmpeg='ffmpeg', codec_args=DEFAULT_CODEC_ARGS):
+    """A function to return the ffmpeg command line encoding raw frames from stdin into path."""
+    return [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+            '-f', 'rawvideo', '-pix_fmt', RAW_PIXEL_FORMAT, '-s', f"{width}x{height}", '-r', f"{fps:g}",
+            '-i', '-', *codec_args, path]
+
+
+class FrameBuffer:
+    """A class to hold one preallocated frame: an image to paint into, and a view of its pixels for the pipe."""
+
+    def __init__(self, width, height):
+        self.image = QImage(width, height, QImage.Format_RGB32)
+        # 32-bit rows are never padded, so the image's memory is exactly one raw frame
+        bits = self.image.constBits()
+        bits.setsize(self.image.sizeInBytes())
+        self.pixels = memoryview(bits)
+
+
+class EncoderStream:
+    """A class to stream frames into an encoder process through a bounded queue of reused buffers.
+
+    Frames are written by taking a buffer with acquire(), painting into its image and handing it
+    back with submit(), which wait while the encoder is behind, or by offer(), which never waits. At
+    most queue_depth frames are ever waiting for the encoder. The writer holds on to the last buffer
+    it wrote until the next one arrives, for offer() to repeat, which takes one buffer more than
+    queue_depth.
+    """
+
+    def __init__(self, command, width, height, queue_depth=3):
+        """A method to start the encoder process (a command line, see encoder_command) and its writer thread."""
+        self.width = width
+        self.height = height
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+        self.free = queue.Queue()
+        for _ in range(queue_depth + 1):
+            self.free.put(FrameBuffer(width, height))
+        self.ready = queue.Queue(maxsize=queue_depth)
+        self.last = None
+
+        self.frames = 0
+        self.repeats = 0
+        self.dropped = 0
+        self.bytes = 0
+        self.wait_s = 0.0
+        self.error = None
+        self.start = time.perf_counter()
+        self.elapsed_s = 0.0
+
+        self.writer = threading.Thread(target=self.write_frames, name='encoder-writer', daemon=True)
+        self.writer.start()
+
+    def acquire(self):
+        """A method to return a free buffer, waiting while the encoder is behind.
+
+        Raises OSError if the encoder stopped taking frames.
+        """
+        start = time.perf_counter()
+        buffer = self.free.get()
+        self.wait_s += time.perf_counter() - start
+        if self.error is not None:
+            self.free.put(buffer)
+            raise OSError(f"The encoder stopped taking frames: {self.error}")
+        return buffer
+
+    def submit(self, buffer):
+        """A method to queue a painted buffer for the encoder."""
+        self.ready.put(buffer)
+
+    def offer(self, paint=None):
+        """A method to queue one frame without waiting, for a source that cannot wait for the encoder.
+
+        paint(image) paints a new frame into a free buffer. Without paint, or while no buffer is free,
+        the last frame is queued again instead (nothing before the first one). While the queue is
+        full, the frame is dropped and counted. Returns whether paint was called.
+        Raises OSError if the encoder stopped taking frames.
+        """
+        if self.error is not None:
+            raise OSError(f"The encoder stopped taking frames: {self.error}")
+        # Only the caller's thread fills the queue, so it cannot fill up between the check and the put
+        if self.ready.full():
+            self.dropped += 1
+            return False
+        if paint is not None:
+            try:
+                buffer = self.free.get_nowait()
+            except queue.Empty:
+                buffer = None
+            if buffer is not None:
+                paint(buffer.image)
+                self.ready.put(buffer)
+                return True
+        self.ready.put(REPEAT)
+        return False
+
+    def write_frames(self):
+        """A method run by the writer thread to pipe queued buffers to the encoder, in order."""
+        while True:
+            buffer = self.ready.get()
+            if buffer is None:
+                break
+            if buffer is REPEAT:
+                buffer = self.last
+                if buffer is None:
+                    continue
+                self.repeats += 1
+            else:
+                # The previous frame can be painted over once a newer one replaces it for repeats
+                if self.last is not None:
+                    self.free.put(self.last)
+                self.last = buffer
+            # Once the pipe broke, frames are only dropped, so acquire() raises instead of waiting
+            if self.error is None:
+                try:
+                    self.process.stdin.write(buffer.pixels)
+                    self.frames += 1
+                    self.bytes += len(buffer.pixels)
+                except OSError as error:
+                    self.error = error
+        if self.last is not None:
+            self.free.put(self.last)
+            self.last = None
+
+    def close(self):
+        """A method to finish the stream: write the queued frames and wait for the encoder to exit.
+
+        Raises RuntimeError if a frame could not be written or the encoder failed.
+        """
+        self.ready.put(None)
+        self.writer.join()
+        try:
+            self.process.stdin.close()
+        except OSError as error:
+            self.error = self.error or error
+        returncode = self.process.wait()
+        self.elapsed_s = time.perf_counter() - self.start
+        if self.error is not None or returncode != 0:
+            raise RuntimeError(f"Encoding failed (encoder exit code {returncode}): {self.error}")
+
+    def report(self):
+        """A method to summarize the throughput of the stream."""
+        elapsed_s = self.elapsed_s or time.perf_counter() - self.start
+        return (f"Encoded {self.frames} frames ({self.width}x{self.height}, {self.repeats} repeated, "
+                f"{self.dropped} dropped) in {elapsed_s:.2f} s: "
+                f"{self.frames / elapsed_s:.1f} frames/s, {self.bytes / elapsed_s / 1e6:.1f} MB/s, "
+                f"{self.wait_s:.2f} s waiting on the encoder")
+
+
+def encode_frames(params, first, last, width, height, path, fps=60, antialias=False, queue_depth=3,
+                  ffmpeg='ffmpeg', codec_args=DEFAULT_CODEC_ARGS, design_width=None):
+    """A function to render frames first..last-1 straight into a video file. Returns the finished EncoderStream.
+
+    params is a DesignParams or a recorded session, and design_width lays the design out for another
+    width than the video's, as for line_art.export.export_frames.
+    """
+    from line_art.export import frame_params, offscreen_app, output_renderer
+
+    offscreen_app()
+    renderer = output_renderer(width, height, antialias, design_width)
+    stream = EncoderStream(encoder_command(path, width, height, fps, ffmpeg, codec_args), width, height,
+                           queue_depth)
+    try:
+        for frame in range(first, last):
+            buffer = stream.acquire()
+            renderer.use_image(buffer.image)
+            renderer.render(frame_params(params, frame, fps))
+            stream.submit(buffer)
+    finally:
+        stream.close()
+    return stream
@@ -0,0 +1,257 @@
+# export.py - Headless batch export of design frames.
+# Renders a range of frames for a parameter set without opening a window, either as numbered
+# PNG files or as raw RGB24 on stdout for piping into an encoder:
+#
+#   python -m line_art.export --width 1920 --height 1080 --frames 0:600 --out frames/
+#   python -m line_art.export --frames 0:600 --raw | ffmpeg -f rawvideo -pix_fmt rgb24 -s 1920x1080 -r 60 -i - out.mp4
+#
+# or, with --encode, straight into a video file through an ffmpeg process (see line_art.encode).
+# Every frame is a pure function of the parameters, so --jobs N splits the range across N worker
+# processes, each with its own offscreen renderer, and the frames are written back in order.
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from line_art.params import DesignParams, SIMULATION_RATE, FORWARD, BACKWARD, PAUSED
+
+DIRECTIONS = {'forward': FORWARD, 'backward': BACKWARD, 'paused': PAUSED}
+
+
+def offscreen_app(widgets=False):
+    """A function to return the running Qt application, creating an offscreen one if there is none.
+
+    Pass widgets=True when QGraphicsScene or other widget classes will be used.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtGui import QGuiApplication
+    from PyQt5.QtWidgets import QApplication
+
+    if QGuiApplication.instance() is not None:
+        return QGuiApplication.instance()
+    return QApplication([sys.argv[0]]) if widgets else QGuiApplication([sys.argv[0]])
+
+
+def frame_params(params, frame, fps):
+    """A function to return the parameters of frame number `frame` of an animation played at fps.
+
+    params is either a DesignParams, animated from its starting point, or a recorded session
+    (line_art.recording.Recording), which gives the parameters of every frame itself.
+    """
+    if not isinstance(params, DesignParams):
+        return params.frame_params(frame, fps)
+    return params.copy(starting_point=params.point_after(frame * SIMULATION_RATE / fps))
+
+
+def output_renderer(width, height, antialias=False, design_width=None):
+    """A function to return an OffscreenRenderer drawing width x height frames.
+
+    With a design_width, the design is laid out as a window that wide shows it, and scaled to the
+    output size with the renderer's render scale. Otherwise it is laid out for an image_width of width.
+    """
+    from line_art.render import OffscreenRenderer
+
+    if design_width is None or design_width == width:
+        return OffscreenRenderer(width, height, antialias=antialias)
+    scale = width / design_width
+    return OffscreenRenderer(design_width, height / scale, antialias=antialias, scale=scale)
+
+
+def export_frames(params, first, last, width, height, fps=60, out_dir=None, raw_stream=None,
+                  antialias=False, design_width=None):
+    """A function to render frames first..last-1, to PNG files in out_dir or as raw RGB to raw_stream.
+
+    design_width lays the design out for another width than the output's (see output_renderer).
+    """
+    offscreen_app()
+    renderer = output_renderer(width, height, antialias, design_width)
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+
+    for frame in range(first, last):
+        image = renderer.render(frame_params(params, frame, fps))
+        if raw_stream is not None:
+            raw_stream.write(renderer.rgb_bytes())
+        else:
+            path = os.path.join(out_dir, f"frame_{frame:06d}.png")
+            if not image.save(path):
+                raise OSError(f"Could not write {path}")
+
+
+# The renderer owned by a worker process of a parallel export
+_worker_renderer = None
+
+
+def _start_worker(width, height, antialias, design_width):
+    """A function to give a worker process its own offscreen application and renderer."""
+    global _worker_renderer
+
+    offscreen_app()
+    _worker_renderer = output_renderer(width, height, antialias, design_width)
+
+
+def _render_chunk(params, frames, fps, out_dir):
+    """A function run in a worker to render a chunk of frames.
+
+    PNG frames are written by the worker itself; raw frames are returned as RGB bytes, in order.
+    """
+    results = []
+    for frame in frames:
+        image = _worker_renderer.render(frame_params(params, frame, fps))
+        if out_dir is None:
+            results.append(_worker_renderer.rgb_bytes())
+        else:
+            path = os.path.join(out_dir, f"frame_{frame:06d}.png")
+            if not image.save(path):
+                raise OSError(f"Could not write {path}")
+    return results
+
+
+def export_frames_parallel(params, first, last, width, height, fps=60, out_dir=None, raw_stream=None,
+                           antialias=False, jobs=None, chunk_size=2, design_width=None):
+    """A function to render frames first..last-1 across a pool of worker processes.
+
+    Chunks of chunk_size frames are handed out in order, and at most 2 * jobs chunks are in flight
+    at once, so no more than 2 * jobs * chunk_size frames are ever held in memory. Raw frames are
+    written to raw_stream in frame order as their chunks complete.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+
+    chunks = iter([range(start, min(start + chunk_size, last)) for start in range(first, last, chunk_size)])
+
+    # Qt is not fork-safe, so workers are always started fresh
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(jobs, mp_context=context, initializer=_start_worker,
+                             initargs=(width, height, antialias, design_width)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_render_chunk, params, chunk, fps, out_dir))
+            if len(pending) >= 2 * jobs:
+                break
+
+        while pending:
+            results = pending.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.submit(_render_chunk, params, chunk, fps, out_dir))
+            if raw_stream is not None:
+                for data in results:
+                    raw_stream.write(data)
+
+
+def parse_frame_range(text):
+    """A function to parse a 'first:last' frame range (last is exclusive)."""
+    first, separator, last = text.partition(':')
+    if not separator:
+        raise argparse.ArgumentTypeError(f"frame range must look like 'first:last', got '{text}'")
+    return int(first), int(last)
+
+
+def params_from_args(args):
+    """A function to build the design parameters from a --params file and individual overrides."""
+    values = {}
+    if args.params:
+        with open(args.params) as params_file:
+            values.update(json.load(params_file))
+
+    overrides = {
+        'starting_point': args.starting_point,
+        'speed': args.speed,
+        'rect_width': args.rect_width,
+        'rect_count': args.rect_count,
+        'prox_to_center': args.prox_to_center,
+        'line_thickness': args.line_thickness,
+        'op_list': list(args.ops) if args.ops else None,
+        'trig_names': args.trigs.split(',') if args.trigs else None,
+        'palette': args.palette,
+        'direction': DIRECTIONS[args.direction] if args.direction else None
+    }
+    values.update({field: value for field, value in overrides.items() if value is not None})
+    return DesignParams.from_dict(values)
+
+
+def add_output_arguments(parser):
+    """A function to add the output options (PNG frames, raw stdout or an encoded video) shared by the export tools."""
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--out', default='frames', help="directory for PNG frames")
+    output.add_argument('--raw', action='store_true', help="write raw RGB24 frames to stdout instead")
+    output.add_argument('--encode', metavar='VIDEO', help="stream the frames into ffmpeg, encoding VIDEO, instead")
+    parser.add_argument('--ffmpeg', default='ffmpeg', help="ffmpeg executable used by --encode")
+    parser.add_argument('--codec-args', help="ffmpeg output options used by --encode "
+                                             "(default: '-c:v libx264 -preset veryfast -pix_fmt yuv420p')")
+    parser.add_argument('--queue-depth', type=int, default=3,
+                        help="frames --encode renders ahead of the encoder before waiting for it")
+
+
+def write_output(params, first, last, args, design_width=None):
+    """A function to render frames first..last-1 to the output chosen by the options of add_output_arguments.
+
+    design_width lays the design out for another width than the output's (see output_renderer).
+    """
+    if args.encode:
+        if args.jobs != 1:
+            raise SystemExit("--encode renders in a single process, --jobs is not supported with it")
+        from line_art.encode import DEFAULT_CODEC_ARGS, encode_frames
+
+        codec_args = args.codec_args.split() if args.codec_args else DEFAULT_CODEC_ARGS
+        try:
+            stream = encode_frames(params, first, last, args.width, args.height, args.encode, args.fps,
+                                   args.antialias, args.queue_depth, args.ffmpeg, codec_args, design_width)
+        except FileNotFoundError as error:
+            raise SystemExit(f"Could not start the encoder '{args.ffmpeg}' ({error.strerror}): install ffmpeg, "
+                             f"or give its path with --ffmpeg")
+        print(stream.report(), file=sys.stderr)
+        return
+
+    output = {'raw_stream': sys.stdout.buffer} if args.raw else {'out_dir': args.out}
+    if args.jobs == 1:
+        export_frames(params, first, last, args.width, args.height, args.fps,
+                      antialias=args.antialias, design_width=design_width, **output)
+    else:
+        export_frames_parallel(params, first, last, args.width, args.height, args.fps,
+                               antialias=args.antialias, jobs=args.jobs or None,
+                               chunk_size=args.chunk_size, design_width=design_width, **output)
+    if args.raw:
+        sys.stdout.buffer.flush()
+
+
+def build_parser():
+    """A function to build the command line parser shared by the export tools."""
+    parser = argparse.ArgumentParser(description="Render frames of the design without a window.")
+    parser.add_argument('--params', help="JSON file of design parameters (see DesignParams.FIELDS)")
+    parser.add_argument('--starting-point', type=float)
+    parser.add_argument('--speed', type=float)
+    parser.add_argument('--rect-width', type=float)
+    parser.add_argument('--rect-count', type=int)
+    parser.add_argument('--prox-to-center', type=int)
+    parser.add_argument('--line-thickness', type=int)
+    parser.add_argument('--ops', help="the seven operators of op_list, e.g. '/-//-++'")
+    parser.add_argument('--trigs', help="13 comma separated trig names (None, Sine, Cosine, Tangent)")
+    parser.add_argument('--palette', help="palette name from palettes.json")
+    parser.add_argument('--direction', choices=sorted(DIRECTIONS))
+    parser.add_argument('--frames', type=parse_frame_range, default=(0, 60), help="frame range first:last")
+    parser.add_argument('--fps', type=float, default=60, help="frame rate the animation is sampled at")
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--antialias', action='store_true')
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes to render with, 0 for one per core")
+    parser.add_argument('--chunk-size', type=int, default=2, help="frames handed to a worker at a time")
+    add_output_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    params = params_from_args(args)
+    first, last = args.frames
+    write_output(params, first, last, args)
+
+
+if __name__ == '__main__':
+    main()
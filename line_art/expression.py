@@ -0,0 +1,221 @@
+# expression.py - The design equation as an expression tree, compiled per configuration.
+# The op_list / trig_list configuration only changes on a key press, so each configuration is
+# turned into a specialized Python function once and kept in an LRU cache keyed by its tuple.
+# Terms are hoisted to the outermost loop level they depend on before the function is generated.
+
+from functools import lru_cache
+
+import numpy as np
+
+
+class Var:
+    """A class for an input of the design equation (image_half, prox_to_center, rect_width, point or rows)."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Trig:
+    """A class for a trigonometric slot, filled from trig_list[slot]."""
+
+    def __init__(self, slot, arg):
+        self.slot = slot
+        self.arg = arg
+
+
+class BinOp:
+    """A class for an arithmetic slot, filled from op_list[slot]."""
+
+    def __init__(self, slot, left, right):
+        self.slot = slot
+        self.left = left
+        self.right = right
+
+
+# The inputs of the design equation. 'point' is the starting point seen by a row and 'rows' is i.
+INPUTS = ('image_half', 'prox_to_center', 'rect_width', 'point', 'rows')
+
+# The loop levels a term can be evaluated at: once per frame, or once per row i of the design.
+# No input depends on j, so nothing is ever left in the inner rectangle loop.
+FRAME = 0
+ROW = 1
+LEVEL_NAMES = ('frame', 'row')
+
+# The design equation, one tree per output
+DESIGN_TREE = {
+    # The starting x-value of the first rectangle
+    'x': BinOp(1, Trig(0, Trig(1, BinOp(0, Var('image_half'), Trig(2, Var('prox_to_center'))))),
+               BinOp(2, Trig(3, Var('point')), Trig(4, Var('rows')))),
+
+    # The starting y-value of the first rectangle
+    'y': BinOp(4, Trig(5, BinOp(3, Trig(6, Var('image_half')), Trig(7, Var('prox_to_center')))),
+               Trig(8, Var('point'))),
+
+    # The x length of the first rectangle
+    'width': BinOp(5, Trig(9, Var('rect_width')), Trig(10, Var('point'))),
+
+    # The y length of the first rectangle
+    'height': BinOp(6, Trig(11, Var('rect_width')), Trig(12, Var('point')))
+}
+
+OUTPUTS = ('x', 'y', 'width', 'height')
+
+
+def tree_dependencies(node):
+    """A function to return what a node depends on: ('input', name), ('op', slot) and ('trig', slot) keys."""
+    if isinstance(node, Var):
+        return {('input', node.name)}
+    if isinstance(node, Trig):
+        return {('trig', node.slot)} | tree_dependencies(node.arg)
+    return {('op', node.slot)} | tree_dependencies(node.left) | tree_dependencies(node.right)
+
+
+# The inputs and op_list / trig_list slots each output is built from
+OUTPUT_DEPENDENCIES = {output: frozenset(tree_dependencies(DESIGN_TREE[output])) for output in OUTPUTS}
+
+# The source spelling of each trigonometric option; 'None' leaves its argument untouched
+TRIG_SOURCE = {
+    'None': None,
+    'Sine': 'sin',
+    'Cosine': 'cos',
+    'Tangent': 'tan'
+}
+
+COMPILE_NAMESPACE = {
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan
+}
+
+
+def input_levels(point_varies):
+    """A function to return the loop level of each input.
+
+    The starting point only varies between rows while the design is moving; when it is fixed
+    every term built from it can be evaluated once per frame.
+    """
+    return {
+        'image_half': FRAME,
+        'prox_to_center': FRAME,
+        'rect_width': FRAME,
+        'point': ROW if point_varies else FRAME,
+        'rows': ROW
+    }
+
+
+def node_level(node, levels):
+    """A function to return the outermost loop level a node can be evaluated at."""
+    if isinstance(node, Var):
+        return levels[node.name]
+    if isinstance(node, Trig):
+        return node_level(node.arg, levels)
+    return max(node_level(node.left, levels), node_level(node.right, levels))
+
+
+class HoistPlan:
+    """A class to split a configuration into named terms, each tagged with the loop level it runs at.
+
+    Every arithmetic or trigonometric node becomes one term, so identical sub-expressions are shared
+    and each term can be evaluated at the outermost level its inputs allow.
+    """
+
+    def __init__(self, op_list, trig_names, point_varies, outputs=OUTPUTS):
+        self.op_list = op_list
+        self.trig_names = trig_names
+        self.levels = input_levels(point_varies)
+        self.terms = []
+        self.names = {}
+        self.outputs = {}
+
+        for output in outputs:
+            tree = DESIGN_TREE[output]
+            self.outputs[output] = (node_level(tree, self.levels), self.emit(tree))
+
+    def term(self, source, level):
+        """A method to name a hoisted term, sharing the name between identical terms."""
+        if source not in self.names:
+            name = f"{LEVEL_NAMES[level]}_{len(self.terms)}"
+            self.names[source] = name
+            self.terms.append((name, level, source))
+        return self.names[source]
+
+    def emit(self, node):
+        """A method to spell out a node and return the name of the term holding its value."""
+        if isinstance(node, Var):
+            return node.name
+
+        if isinstance(node, Trig):
+            function = TRIG_SOURCE[self.trig_names[node.slot]]
+            arg = self.emit(node.arg)
+            if function is None:
+                return arg
+            source = f"{function}({arg})"
+        else:
+            source = f"{self.emit(node.left)} {self.op_list[node.slot]} {self.emit(node.right)}"
+
+        return self.term(source, node_level(node, self.levels))
+
+    def report(self):
+        """A method to describe which terms were hoisted and to which level."""
+        lines = []
+        for name, level, source in self.terms:
+            lines.append(f"{name:<10} {LEVEL_NAMES[level]:<6} {source}")
+        for output, (level, source) in self.outputs.items():
+            lines.append(f"{output:<10} {LEVEL_NAMES[level]:<6} {source}")
+
+        hoisted = sum(1 for name, level, source in self.terms if level == FRAME)
+        lines.append(f"{hoisted} of {len(self.terms)} terms hoisted to once per frame, "
+                     f"{len(self.terms) - hoisted} evaluated once per row, none per rectangle")
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=128)
+def compile_design(op_list, trig_names, point_varies=True, outputs=OUTPUTS):
+    """A function to compile a configuration into a function of the design inputs.
+
+    op_list and trig_names must be tuples so the configuration can be cached. The returned function
+    takes the INPUTS as NumPy scalars or per-row arrays and returns the x, y, width and height terms,
+    each either a scalar (frame level) or an array with one value per row. Frame-level terms are
+    computed once, ahead of the row terms, and terms shared between outputs are computed only once.
+    Given a tuple of some of the OUTPUTS, only those are computed and returned, in that order.
+    """
+    plan = HoistPlan(op_list, trig_names, point_varies, outputs)
+
+    lines = [f"def design({', '.join(INPUTS)}):"]
+    for level in (FRAME, ROW):
+        for name, term_level, source in plan.terms:
+            if term_level == level:
+                lines.append(f"    {name} = {source}")
+        for output in outputs:
+            output_level, source = plan.outputs[output]
+            if output_level == level:
+                lines.append(f"    {output} = {source}")
+    lines.append(f"    return {', '.join(outputs)},")
+    source = "\n".join(lines)
+
+    namespace = dict(COMPILE_NAMESPACE)
+    exec(compile(source, f"<design {''.join(op_list)}>", 'exec'), namespace)
+    design = namespace['design']
+    design.source = source
+    design.plan = plan
+    return design
+
+
+def hoist_report(op_list, trig_names, point_varies=True):
+    """A function to return the hoisting report of a configuration."""
+    return compile_design(tuple(op_list), tuple(trig_names), point_varies).plan.report()
+
+
+if __name__ == '__main__':
+    # Print the hoisting report, e.g. python -m line_art.expression --ops "/-//-++" --trigs None,Sine
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show which design terms are hoisted for a configuration.")
+    parser.add_argument('--ops', default='/-//-++', help="the seven operators of op_list")
+    parser.add_argument('--trigs', default='', help="comma separated trig names, missing slots are 'None'")
+    parser.add_argument('--paused', action='store_true', help="treat the starting point as fixed")
+    args = parser.parse_args()
+
+    trigs = [name for name in args.trigs.split(',') if name]
+    trigs += ['None'] * (13 - len(trigs))
+    print(hoist_report(list(args.ops), trigs, not args.paused))
@@ -0,0 +1,152 @@
+# frame_cache.py - A cache of evaluated frame geometry, and a seekable timeline over it.
+# Playing backwards, soft resets, scrubbing and ping-pong loops revisit starting points that were
+# already drawn. Each evaluated FrameGeometry is kept in a memory-bounded LRU cache keyed by the
+# parameters that shape the geometry and the quantized starting point, so revisiting a frame is a lookup.
+
+from collections import OrderedDict
+
+from line_art.frame_model import FrameModel
+from line_art.geometry import frame_for
+
+
+def geometry_key(params, image_width, column_stride=1):
+    """A function to return a hashable key of everything but the starting point that shapes a frame's geometry.
+
+    The palette only colors the rectangles, so frames are shared between palettes.
+    """
+    return (params.op_list, params.trig_names, params.rect_count, params.rect_width, params.prox_to_center,
+            params.row_step(), params.line_thickness, image_width, column_stride)
+
+
+def frame_bytes(frame):
+    """A function to return the memory held by a frame's arrays."""
+    return sum(values.nbytes for values in (frame.rows, frame.cols, frame.x, frame.y,
+                                            frame.width, frame.height, frame.angle))
+
+
+class FrameCache:
+    """A class to keep recently evaluated frames, evicting the least recently used beyond max_bytes."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, quantum=1e-6):
+        """A method to create an empty cache.
+
+        Starting points are quantized to multiples of quantum, far below anything visible, so a point
+        reached by stepping forward and then back again finds the frame despite floating point drift.
+        """
+        self.max_bytes = max_bytes
+        self.quantum = quantum
+        self.frames = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def key(self, params, image_width, column_stride=1):
+        """A method to return the cache key of a frame."""
+        return geometry_key(params, image_width, column_stride), round(params.starting_point / self.quantum)
+
+    def has(self, params, image_width, column_stride=1):
+        """A method to return whether the frame for params is cached, without counting a lookup."""
+        return self.key(params, image_width, column_stride) in self.frames
+
+    def get(self, params, image_width, column_stride=1):
+        """A method to return the cached frame for params, or None if it is not cached."""
+        key = self.key(params, image_width, column_stride)
+        frame = self.frames.get(key)
+        if frame is None:
+            self.misses += 1
+            return None
+        self.frames.move_to_end(key)
+        self.hits += 1
+        return frame
+
+    def put(self, params, image_width, column_stride, frame):
+        """A method to add a frame evaluated elsewhere, evicting the least recently used beyond max_bytes."""
+        key = self.key(params, image_width, column_stride)
+        if key in self.frames:
+            return
+        self.frames[key] = frame
+        self.size += frame_bytes(frame)
+        while self.size > self.max_bytes and len(self.frames) > 1:
+            evicted_key, evicted = self.frames.popitem(last=False)
+            self.size -= frame_bytes(evicted)
+
+    def frame(self, params, image_width, column_stride=1):
+        """A method to return the frame for params, evaluating and caching it if it is not cached yet."""
+        frame = self.get(params, image_width, column_stride)
+        if frame is None:
+            frame = frame_for(params, image_width, column_stride)
+            self.put(params, image_width, column_stride, frame)
+        return frame
+
+    def clear(self):
+        """A method to drop every cached frame."""
+        self.frames.clear()
+        self.size = 0
+
+    def stats_text(self):
+        """A method to format the cache's size and hit rate for the HUD."""
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups else 0.0
+        return (f"Frame cache {len(self.frames)} frames  {self.size / 1048576:.1f}/{self.max_bytes / 1048576:.0f} MB"
+                f"  hits {hit_rate:.0f}%")
+
+
+class Timeline:
+    """A class to move through the frames of the design by starting point, backed by a FrameCache.
+
+    Frames missing from the cache are evaluated by a FrameModel, so a change to one parameter only
+    recomputes what it affects. While a PingPongLoop is set, moving past either end of it reflects
+    back in the other direction.
+    """
+
+    def __init__(self, cache, image_width):
+        self.cache = cache
+        self.image_width = image_width
+        self.model = FrameModel(image_width)
+        self.loop = None
+
+    def frame(self, params, column_stride=1):
+        """A method to return the frame of params."""
+        frame = self.cache.get(params, self.image_width, column_stride)
+        if frame is None:
+            frame = self.model.evaluate(params, column_stride)
+            self.cache.put(params, self.image_width, column_stride, frame)
+        return frame
+
+    def seek(self, params, starting_point, column_stride=1):
+        """A method to return the frame of params at another starting point."""
+        return self.frame(params.copy(starting_point=starting_point), column_stride)
+
+    def move(self, starting_point, distance, direction):
+        """A method to move a starting point by distance in a direction (FORWARD or BACKWARD).
+
+        Returns the new starting point and the direction to continue in.
+        """
+        starting_point += distance * direction
+        if self.loop is not None:
+            return self.loop.wrap(starting_point, direction)
+        return starting_point, direction
+
+
+class PingPongLoop:
+    """A class for a loop between two starting points that reverses direction at either end."""
+
+    def __init__(self, first, second):
+        self.low = min(first, second)
+        self.high = max(first, second)
+
+    def wrap(self, starting_point, direction):
+        """A method to reflect a starting point that left the loop back into it.
+
+        Returns the starting point and the direction to continue in.
+        """
+        if self.high == self.low:
+            return self.low, direction
+        if starting_point > self.high:
+            return max(2 * self.high - starting_point, self.low), -1
+        if starting_point < self.low:
+            return min(2 * self.low - starting_point, self.high), 1
+        return starting_point, direction
@@ -0,0 +1,90 @@
+# frame_model.py - Recomputing only the parts of a frame that a parameter change affects.
+# Each output of the design equation (x, y, width, height) is built from a few inputs and op_list /
+# trig_list slots, which line_art.expression reads off the equation's tree. The model keeps the
+# per-row values of the last frame it evaluated, and on the next one only re-evaluates the outputs
+# whose inputs or slots changed. A thickness change only re-culls, since it widens the pen margin,
+# a palette change reuses the frame as it is (pens are looked up separately, per palette, rect_count
+# and line_thickness), and unchanged parameters cost no recomputation at all.
+
+from line_art.expression import OUTPUTS, OUTPUT_DEPENDENCIES
+from line_art.geometry import FrameGeometry, cull_frame, evaluate_rows, layout_slots
+
+
+def changed_inputs(old, new):
+    """A function to return the dependency keys of expression.OUTPUT_DEPENDENCIES that differ between two DesignParams.
+
+    rect_count and the image width change the layout itself, so they are not compared here.
+    """
+    keys = set()
+    if old.prox_to_center != new.prox_to_center:
+        keys.add(('input', 'prox_to_center'))
+    if old.rect_width != new.rect_width:
+        keys.add(('input', 'rect_width'))
+    # The point a row sees is the starting point, staggered between rows by row_step while moving
+    if old.starting_point != new.starting_point or old.row_step() != new.row_step():
+        keys.add(('input', 'point'))
+    keys.update(('op', slot) for slot, (before, after) in enumerate(zip(old.op_list, new.op_list))
+                if before != after)
+    keys.update(('trig', slot) for slot, (before, after) in enumerate(zip(old.trig_names, new.trig_names))
+                if before != after)
+    return keys
+
+
+def affected_outputs(old, new):
+    """A function to return the outputs that have to be re-evaluated going from one DesignParams to another."""
+    keys = changed_inputs(old, new)
+    return tuple(output for output in OUTPUTS if OUTPUT_DEPENDENCIES[output] & keys)
+
+
+class FrameModel:
+    """A class to evaluate frames incrementally, from the last frame it evaluated.
+
+    Frames are the same as line_art.geometry.frame_for gives. The arrays of outputs that did not
+    change are shared with earlier frames, so they must not be modified in place.
+    """
+
+    def __init__(self, image_width):
+        self.image_width = image_width
+        self.params = None
+        self.layout = None
+        self.slots = None
+        self.spread = {}
+        self.full_frame = None
+        self.frame = None
+        self.updated = ()
+
+    def evaluate(self, params, column_stride=1):
+        """A method to return the frame of params, re-evaluating only what changed since the last call.
+
+        The parts updated ('x', 'y', 'width', 'height' and 'cull') are left in self.updated.
+        """
+        layout = (params.rect_count, column_stride)
+        if self.params is None or layout != self.layout:
+            outputs = OUTPUTS
+            self.layout = layout
+            self.slots = layout_slots(params.rect_count, self.image_width, column_stride)
+        else:
+            outputs = affected_outputs(self.params, params)
+        recull = bool(outputs) or params.line_thickness != self.params.line_thickness
+
+        if outputs:
+            rows, cols, row_index, angles = self.slots
+            values = evaluate_rows(params.op_list, params.trig_names, self.image_width, params.rect_count,
+                                   params.rect_width, params.prox_to_center, params.starting_point,
+                                   params.row_step(), outputs)
+            for output, row_values in values.items():
+                self.spread[output] = row_values[row_index]
+            self.full_frame = FrameGeometry(rows, cols, *(self.spread[output] for output in OUTPUTS), angles)
+        if recull:
+            self.frame, stats = cull_frame(self.full_frame, self.image_width, params.line_thickness)
+            self.frame.cull_stats = stats
+
+        self.params = params
+        self.updated = outputs + (('cull',) if recull else ())
+        return self.frame
+
+    def stats_text(self):
+        """A method to describe the last update for the HUD."""
+        if not self.updated:
+            return "Frame model: nothing recomputed"
+        return f"Frame model: updated {', '.join(self.updated)}"
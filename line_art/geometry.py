@@ -0,0 +1,233 @@
+# geometry.py - Vectorized geometry for the design equation.
+# Every rectangle of a frame is evaluated in one batched NumPy pass, so the Qt layer only has
+# to consume the resulting arrays of x, y, width, height and rotation angle.
+
+from functools import lru_cache
+
+import numpy as np
+
+from line_art.expression import OUTPUTS, compile_design
+
+
+class FrameGeometry:
+    """A class to hold the evaluated rectangles of a single frame as parallel arrays."""
+
+    def __init__(self, rows, cols, x, y, width, height, angle):
+        self.rows = rows
+        self.cols = cols
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.angle = angle
+        self.cull_stats = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def take(self, indices):
+        """A method to return a FrameGeometry of only the rectangles at the given indices."""
+        return FrameGeometry(self.rows[indices], self.cols[indices], self.x[indices], self.y[indices],
+                             self.width[indices], self.height[indices], self.angle[indices])
+
+
+class CullStats:
+    """A class to count the rectangles of a frame that were dropped by culling, and why."""
+
+    def __init__(self, total=0, non_finite=0, degenerate=0, off_canvas=0):
+        self.total = total
+        self.non_finite = non_finite
+        self.degenerate = degenerate
+        self.off_canvas = off_canvas
+
+    @property
+    def culled(self):
+        return self.non_finite + self.degenerate + self.off_canvas
+
+    @property
+    def kept(self):
+        return self.total - self.culled
+
+    def to_dict(self):
+        """A method to return the counts as a JSON-friendly dictionary."""
+        return {'total': self.total, 'non_finite': self.non_finite, 'degenerate': self.degenerate,
+                'off_canvas': self.off_canvas, 'kept': self.kept}
+
+
+@lru_cache(maxsize=16)
+def design_slots(rect_count, image_width):
+    """A function to return the (i, j) slot of every rectangle as two read-only arrays."""
+    step = max(int(image_width / rect_count), 1)
+    rows = []
+    cols = []
+    for i in range(1, rect_count):
+        row_cols = np.arange(i, image_width, step)
+        rows.append(np.full(len(row_cols), i))
+        cols.append(row_cols)
+    if rows:
+        rows = np.concatenate(rows).astype(float)
+        cols = np.concatenate(cols).astype(float)
+    else:
+        rows = np.empty(0)
+        cols = np.empty(0)
+    rows.flags.writeable = False
+    cols.flags.writeable = False
+    return rows, cols
+
+
+@lru_cache(maxsize=16)
+def slot_row_index(rect_count, image_width):
+    """A function to return, for every slot, the index of its row in a per-row array."""
+    rows, cols = design_slots(rect_count, image_width)
+    row_index = rows.astype(int) - 1
+    row_index.flags.writeable = False
+    return row_index
+
+
+@lru_cache(maxsize=16)
+def thinned_slots(rect_count, image_width, column_stride):
+    """A function to return the indices of the slots kept when only every column_stride-th rectangle
+    of each row is drawn. Every row keeps its first rectangle.
+    """
+    rows, cols = design_slots(rect_count, image_width)
+    step = max(int(image_width / rect_count), 1)
+    column_index = np.round((cols - rows) / step).astype(int)
+    kept = np.flatnonzero(column_index % column_stride == 0)
+    kept.flags.writeable = False
+    return kept
+
+
+@lru_cache(maxsize=16)
+def slot_angles(rect_count, image_width):
+    """A function to return the rotation of every slot, matching the design's two QTransform.rotate calls.
+
+    The angles only depend on the layout, so they are computed once per (rect_count, image_width).
+    They grow by whole turns along each row, so they are reduced to [0, 360), rounded to 1e-6
+    degrees: slots with the same rotation then have equal angles, and the painter backend draws
+    them under one transform.
+    """
+    rows, cols = design_slots(rect_count, image_width)
+    angles = np.round((rows / cols) * (360 / rect_count)) + cols * (360 / rect_count)
+    angles = np.mod(np.round(np.mod(angles, 360), 6), 360)
+    angles.flags.writeable = False
+    return angles
+
+
+def compute_frame(op_list, trig_names, image_width, rect_count, rect_width, prox_to_center,
+                  starting_point, row_step=0.0, column_stride=1):
+    """A function to evaluate every rectangle of a frame.
+
+    Each row i of the design sees the starting point advanced by row_step once per previous row,
+    which is how the animation has always staggered the rows while moving.
+    The equation itself is compiled once per configuration by line_art.expression.
+    A column_stride above 1 keeps only every column_stride-th rectangle of each row.
+
+    Original, non-alterable code:
+
+        trig(trig(image_half / trig(prox_to_center)) - trig(starting_point) / trig(i)),
+        trig(trig(image_half / trig(prox_to_center)) - trig(starting_point)),
+        trig(rect_width + trig(starting_point)),
+        trig(rect_width + trig(starting_point))
+    """
+    # The design terms never depend on j, so they are evaluated once per row and then spread to the slots
+    values = evaluate_rows(op_list, trig_names, image_width, rect_count, rect_width, prox_to_center,
+                           starting_point, row_step)
+    rows, cols, row_index, angles = layout_slots(rect_count, image_width, column_stride)
+    x, y, width, height = (values[output][row_index] for output in OUTPUTS)
+    return FrameGeometry(rows, cols, x, y, width, height, angles)
+
+
+def evaluate_rows(op_list, trig_names, image_width, rect_count, rect_width, prox_to_center,
+                  starting_point, row_step=0.0, outputs=OUTPUTS):
+    """A function to evaluate design outputs (by default all of x, y, width and height) once per row.
+
+    Returns a dict of each output's array, with one value per row i of the design.
+    """
+    design = compile_design(tuple(op_list), tuple(trig_names), row_step != 0, tuple(outputs))
+
+    row_numbers = np.arange(1, max(rect_count, 1), dtype=float)
+    point = starting_point + (row_numbers - 1) * row_step if row_step != 0 else np.float64(starting_point)
+
+    # Scalars are passed as NumPy floats so a division by zero gives inf instead of raising
+    with np.errstate(all='ignore'):
+        terms = design(np.float64(int(image_width / 2)), np.float64(prox_to_center),
+                       np.float64(rect_width), point, row_numbers)
+
+    row_count = len(row_numbers)
+    return {output: np.broadcast_to(term, row_count).astype(float) for output, term in zip(outputs, terms)}
+
+
+def layout_slots(rect_count, image_width, column_stride=1):
+    """A function to return the rows, columns, per-row indices and angles of the slots drawn at a column stride."""
+    rows, cols = design_slots(rect_count, image_width)
+    row_index = slot_row_index(rect_count, image_width)
+    angles = slot_angles(rect_count, image_width)
+    if column_stride > 1:
+        kept = thinned_slots(rect_count, image_width, column_stride)
+        rows, cols, row_index, angles = rows[kept], cols[kept], row_index[kept], angles[kept]
+    return rows, cols, row_index, angles
+
+
+def scene_bounds(frame, image_half):
+    """A function to return the scene-space bounding box (left, top, right, bottom) of every rectangle.
+
+    Each rectangle is placed by the same transform as its scene item, a translation to
+    (image_half, image_half / 2) followed by a rotation, and rectangles with a negative width or
+    height are measured the way Qt draws them, normalized.
+    """
+    radians = np.radians(frame.angle)
+    cos = np.cos(radians)
+    sin = np.sin(radians)
+
+    half_width = np.abs(frame.width) / 2
+    half_height = np.abs(frame.height) / 2
+    local_x = frame.x + frame.width / 2
+    local_y = frame.y + frame.height / 2
+
+    center_x = image_half + local_x * cos - local_y * sin
+    center_y = image_half / 2 + local_x * sin + local_y * cos
+    extent_x = half_width * np.abs(cos) + half_height * np.abs(sin)
+    extent_y = half_width * np.abs(sin) + half_height * np.abs(cos)
+    return center_x - extent_x, center_y - extent_y, center_x + extent_x, center_y + extent_y
+
+
+def cull_frame(frame, image_width, line_thickness=1, min_extent=0.0):
+    """A function to drop the rectangles of a frame that would not draw anything visible.
+
+    A rectangle is dropped when any of its values is NaN or infinite, when neither of its sides is
+    longer than min_extent, or when its bounding box, grown by the pen, lies entirely outside the
+    image_width x image_width scene. Qt paints nothing for a zero-size rectangle, but its pen still
+    paints a few pixels for one a fraction of a pixel wide, so a min_extent above 0 trades exactness for speed.
+    Returns the kept rectangles as a FrameGeometry and a CullStats of what was dropped.
+    """
+    total = len(frame)
+    with np.errstate(all='ignore'):
+        finite = (np.isfinite(frame.x) & np.isfinite(frame.y)
+                  & np.isfinite(frame.width) & np.isfinite(frame.height))
+        degenerate = finite & (np.abs(frame.width) <= min_extent) & (np.abs(frame.height) <= min_extent)
+
+        left, top, right, bottom = scene_bounds(frame, int(image_width / 2))
+        margin = line_thickness / 2 + 1
+        on_canvas = ((right >= -margin) & (left <= image_width + margin)
+                     & (bottom >= -margin) & (top <= image_width + margin))
+
+    kept = finite & ~degenerate & on_canvas
+    stats = CullStats(total, int(total - np.count_nonzero(finite)), int(np.count_nonzero(degenerate)),
+                      int(np.count_nonzero(finite & ~degenerate & ~on_canvas)))
+    if stats.culled == 0:
+        return frame, stats
+    return frame.take(np.flatnonzero(kept)), stats
+
+
+def frame_for(params, image_width, column_stride=1, cull=True):
+    """A function to evaluate the frame described by a DesignParams at the given image width.
+
+    Unless cull is False, rectangles that would not be visible are dropped, and the frame's
+    cull_stats records how many were dropped and why.
+    """
+    frame = compute_frame(params.op_list, params.trig_names, image_width, params.rect_count,
+                          params.rect_width, params.prox_to_center, params.starting_point, params.row_step(),
+                          column_stride)
+    if cull:
+        frame, frame.cull_stats = cull_frame(frame, image_width, params.line_thickness)
+    return frame
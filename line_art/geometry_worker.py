@@ -0,0 +1,82 @@
+# geometry_worker.py - Evaluating frame geometry off the GUI thread.
+# While frame N is on screen, the geometry of frame N + 1 is evaluated on a worker thread, so a heavy
+# frame no longer holds up key presses and window events. Results are handed back through a double
+# buffer: the worker fills the slot the GUI thread is not reading and then publishes it by bumping a
+# sequence number, so neither side ever waits on a lock.
+
+from concurrent.futures import ThreadPoolExecutor
+
+from line_art.geometry import frame_for
+
+
+class GeometryResult:
+    """A class for a frame evaluated by the worker, with what it was evaluated for."""
+
+    def __init__(self, generation, params, image_width, column_stride, frame):
+        self.generation = generation
+        self.params = params
+        self.image_width = image_width
+        self.column_stride = column_stride
+        self.frame = frame
+
+
+class GeometryWorker:
+    """A class to evaluate one frame at a time on a background thread.
+
+    Every change to the design's parameters should call invalidate(). Results of work started
+    before that are then dropped by take(), so they are never shown.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='geometry')
+        self.in_flight = None
+        self.generation = 0
+
+        # The double buffer: the worker writes buffers[(sequence + 1) % 2], then publishes it by
+        # setting sequence. The GUI thread only reads buffers[sequence % 2].
+        self.buffers = [None, None]
+        self.sequence = -1
+        self.taken = -1
+
+    def invalidate(self):
+        """A method to mark all work started so far as out of date."""
+        self.generation += 1
+
+    def busy(self):
+        """A method to return whether a frame is being evaluated."""
+        return self.in_flight is not None and not self.in_flight.done()
+
+    def submit(self, params, image_width, column_stride=1):
+        """A method to start evaluating a frame. Only one frame is evaluated at a time, so check busy() first."""
+        if self.busy():
+            raise RuntimeError("The geometry worker is still evaluating a frame")
+        self.in_flight = self.executor.submit(self.evaluate, self.generation, params, image_width, column_stride)
+
+    def evaluate(self, generation, params, image_width, column_stride):
+        """A method run on the worker thread to evaluate a frame and publish it."""
+        frame = frame_for(params, image_width, column_stride)
+        sequence = self.sequence + 1
+        self.buffers[sequence % 2] = GeometryResult(generation, params, image_width, column_stride, frame)
+        self.sequence = sequence
+
+    def take(self):
+        """A method to return the newest result not taken yet, or None.
+
+        Results of work started before the last invalidate() are dropped. An exception raised on
+        the worker is raised here.
+        """
+        if self.in_flight is not None and self.in_flight.done():
+            future, self.in_flight = self.in_flight, None
+            future.result()
+
+        sequence = self.sequence
+        if sequence == self.taken:
+            return None
+        self.taken = sequence
+        result = self.buffers[sequence % 2]
+        if result.generation != self.generation:
+            return None
+        return result
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,149 @@
+# instancing.py - Drawing each row of the design as one path of rotated instances.
+# Every rectangle of a row i has the same base rectangle and pen, and only differs in its rotation
+# around the center of the design. Instead of one scene item with its own QTransform per rectangle,
+# the rotated corners of all of a row's instances are computed at once with NumPy, from a cache of
+# rotation matrices keyed by angle, and the row is drawn as a single QPainterPath by one item.
+
+from functools import lru_cache
+from math import cos, radians, sin
+
+import numpy as np
+from PyQt5.QtCore import QByteArray, QDataStream, QIODevice
+from PyQt5.QtGui import QPainterPath
+from PyQt5.QtWidgets import QGraphicsPathItem
+
+# The layout QDataStream reads a QPainterPath element in: type, x, y, all big-endian
+PATH_ELEMENT = np.dtype([('type', '>i4'), ('x', '>f8'), ('y', '>f8')])
+MOVE_TO = 0
+LINE_TO = 1
+
+
+@lru_cache(maxsize=4096)
+def rotation(angle):
+    """A function to return the (cos, sin) of a rotation by angle degrees, exactly as QTransform.rotate uses them."""
+    if angle == 90 or angle == -270:
+        return 0.0, 1.0
+    if angle == 270 or angle == -90:
+        return 0.0, -1.0
+    if angle == 180:
+        return -1.0, 0.0
+    return cos(radians(angle)), sin(radians(angle))
+
+
+def rotations(angles):
+    """A function to return the cos and sin arrays of an array of angles, computing each distinct angle once."""
+    distinct, inverse = np.unique(angles, return_inverse=True)
+    table = np.array([rotation(angle) for angle in distinct.tolist()]).reshape(-1, 2)
+    return table[inverse, 0], table[inverse, 1]
+
+
+def instance_corners(frame, image_half):
+    """A function to return the closed outline of every rectangle of a frame in scene coordinates.
+
+    The result has shape (len(frame), 5, 2): the four corners in the order QPainterPath.addRect
+    visits them, then the first corner again to close the outline.
+    """
+    left, top = frame.x, frame.y
+    right, bottom = frame.x + frame.width, frame.y + frame.height
+    local_x = np.stack([left, right, right, left, left], axis=1)
+    local_y = np.stack([top, top, bottom, bottom, top], axis=1)
+
+    cos_a, sin_a = rotations(frame.angle)
+    cos_a = cos_a[:, None]
+    sin_a = sin_a[:, None]
+    corners = np.empty((len(frame), 5, 2))
+    corners[:, :, 0] = local_x * cos_a - local_y * sin_a + image_half
+    corners[:, :, 1] = local_x * sin_a + local_y * cos_a + image_half / 2
+    return corners
+
+
+def outlines_path(corners):
+    """A function to build one QPainterPath out of closed outlines of shape (count, points, 2).
+
+    The path is deserialized from an array in QDataStream's layout, rather than built by one Python
+    call per point.
+    """
+    count, points = corners.shape[:2]
+    path = QPainterPath()
+    if count == 0:
+        return path
+
+    elements = np.empty((count, points), dtype=PATH_ELEMENT)
+    elements['type'] = LINE_TO
+    elements['type'][:, 0] = MOVE_TO
+    elements['x'] = corners[:, :, 0]
+    elements['y'] = corners[:, :, 1]
+
+    # Element count, the elements, the index of the last subpath's start and the (odd-even) fill rule
+    data = (np.array([count * points], dtype='>i4').tobytes() + elements.tobytes()
+            + np.array([(count - 1) * points, 0], dtype='>i4').tobytes())
+    # The stream reads from the byte array without owning it, so it has to stay referenced
+    buffer = QByteArray(data)
+    stream = QDataStream(buffer, QIODevice.ReadOnly)
+    stream >> path
+    return path
+
+
+class InstancedRowPool:
+    """A class to hold one QGraphicsPathItem per row of the design, drawing all of the row's rectangles."""
+
+    def __init__(self, scene):
+        """A method to create an empty pool for the given scene."""
+        self.scene = scene
+        self.items = {}
+        self.pens = {}
+        self.shown = set()
+        self.frame = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def update_frame(self, frame, pens, image_half):
+        """A method to draw a FrameGeometry, one path per row. Rows without rectangles are hidden.
+
+        Redrawing the frame last drawn only updates the pens that changed.
+        """
+        if frame is self.frame:
+            for row in self.shown:
+                if self.pens[row] is not pens[row]:
+                    self.items[row].setPen(pens[row])
+                    self.pens[row] = pens[row]
+            return
+        self.frame = frame
+
+        rows = frame.rows.astype(int)
+        corners = instance_corners(frame, image_half)
+
+        # Rows are contiguous and in order, so each row is one slice of the frame
+        starts = np.flatnonzero(np.diff(rows, prepend=-1)).tolist()
+        ends = starts[1:] + [len(rows)]
+        drawn = set()
+        for start, end in zip(starts, ends):
+            row = int(rows[start])
+            item = self.items.get(row)
+            if item is None:
+                item = QGraphicsPathItem()
+                # Rows stack in order, however late a row first gets rectangles
+                item.setZValue(row)
+                self.scene.addItem(item)
+                self.items[row] = item
+            elif row not in self.shown:
+                item.show()
+            if self.pens.get(row) is not pens[row]:
+                item.setPen(pens[row])
+                self.pens[row] = pens[row]
+            item.setPath(outlines_path(corners[start:end]))
+            drawn.add(row)
+
+        for row in self.shown - drawn:
+            self.items[row].hide()
+        self.shown = drawn
+
+    def clear(self):
+        """A method to remove every item from the scene and empty the pool."""
+        for item in self.items.values():
+            self.scene.removeItem(item)
+        self.items.clear()
+        self.pens.clear()
+        self.shown.clear()
+        self.frame = None
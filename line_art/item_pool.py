@@ -0,0 +1,139 @@
+# item_pool.py - A persistent pool of QGraphicsRectItems for the design.
+# Rather than adding and clearing rect_count² items on every frame, each (i, j) slot of the
+# design keeps one item that is only updated when its rectangle, pen or transform changes.
+
+from PyQt5.QtGui import QTransform
+from PyQt5.QtWidgets import QGraphicsRectItem
+
+
+class RectItemPool:
+    """A class to hold one QGraphicsRectItem per (i, j) slot of the design."""
+
+    def __init__(self, scene):
+        """A method to create an empty pool for the given scene."""
+        self.scene = scene
+        self.items = {}
+        self.pens = {}
+        self.rect_keys = {}
+        self.shown = set()
+        self.spare = []
+        self.layout_key = None
+        self.frame = None
+        self.frame_pens = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def resize(self, slots, layout_key):
+        """A method to grow or shrink the pool to the given slots.
+
+        Items outside the slots are only removed when the layout key (rect_count, image_width, ...)
+        changes. Within a layout, slots culled from a frame keep their items, hidden, since they are
+        likely to come back on a later frame.
+        Returns the slots whose items are new or belong to a new layout, and so need their transform set.
+        """
+        wanted = set(slots)
+        stale = set()
+        if layout_key != self.layout_key:
+            for slot in list(self.items):
+                if slot not in wanted:
+                    item = self.items.pop(slot)
+                    self.scene.removeItem(item)
+                    self.spare.append(item)
+                    self.pens.pop(slot, None)
+                    self.rect_keys.pop(slot, None)
+            self.shown &= set(self.items)
+            self.layout_key = layout_key
+            stale = set(wanted)
+
+        # New items are added in slot order, and each row stacks over the rows before it, however late
+        # its items are added, just as the rows were drawn when the scene was rebuilt every frame
+        for slot in slots:
+            if slot not in self.items:
+                if self.spare:
+                    item = self.spare.pop()
+                    item.show()
+                else:
+                    item = QGraphicsRectItem()
+                item.setZValue(slot[0])
+                self.scene.addItem(item)
+                self.items[slot] = item
+                self.shown.add(slot)
+                stale.add(slot)
+
+        for slot in self.shown - wanted:
+            self.items[slot].hide()
+        for slot in wanted - self.shown:
+            self.items[slot].show()
+        self.shown = wanted
+        return stale
+
+    def reserve(self, count):
+        """A method to create spare items ahead of time, so a layout of count slots needs no new items.
+
+        Items removed by a layout change are kept as spares too, so switching back and forth between
+        layouts reuses the same items.
+        """
+        while len(self.items) + len(self.spare) < count:
+            self.spare.append(QGraphicsRectItem())
+
+    def item(self, slot):
+        """A method to return the item for a slot."""
+        return self.items[slot]
+
+    def set_rect(self, slot, x, y, width, height):
+        """A method to update an item's rectangle only if it changed."""
+        rect_key = (x, y, width, height)
+        if self.rect_keys.get(slot) != rect_key:
+            self.items[slot].setRect(x, y, width, height)
+            self.rect_keys[slot] = rect_key
+
+    def set_pen(self, slot, pen):
+        """A method to update an item's pen only if it is not already using that shared pen."""
+        if self.pens.get(slot) is not pen:
+            self.items[slot].setPen(pen)
+            self.pens[slot] = pen
+
+    def update_frame(self, frame, pens, image_half, layout_key):
+        """A method to bring the pool in line with a FrameGeometry, touching only what changed.
+
+        Redrawing the frame last drawn only updates the pens, and nothing when they are the same too.
+        """
+        if frame is self.frame and layout_key == self.layout_key:
+            if pens is not self.frame_pens:
+                for slot in self.shown:
+                    self.set_pen(slot, pens[slot[0]])
+                self.frame_pens = pens
+            return
+        self.frame = frame
+        self.frame_pens = pens
+
+        slots = list(zip(frame.rows.astype(int).tolist(), frame.cols.astype(int).tolist()))
+        stale = self.resize(slots, layout_key)
+
+        for slot, x, y, width, height in zip(slots, frame.x.tolist(), frame.y.tolist(),
+                                             frame.width.tolist(), frame.height.tolist()):
+            self.set_pen(slot, pens[slot[0]])
+            self.set_rect(slot, x, y, width, height)
+
+        # The transform only depends on the slot and rect_count, so it is set when an item is new to the layout
+        if stale:
+            for slot, angle in zip(slots, frame.angle.tolist()):
+                if slot in stale:
+                    transform = QTransform()
+                    transform.translate(image_half, image_half / 2)
+                    transform.rotate(angle)
+                    self.items[slot].setTransform(transform)
+
+    def clear(self):
+        """A method to remove every item from the scene and empty the pool."""
+        for item in self.items.values():
+            self.scene.removeItem(item)
+        self.items.clear()
+        self.pens.clear()
+        self.rect_keys.clear()
+        self.shown.clear()
+        self.spare.clear()
+        self.layout_key = None
+        self.frame = None
+        self.frame_pens = None
@@ -0,0 +1,73 @@
+# layout.py - The window layout, compiled ahead of time.
+# Loading New-Line-Art-Designer_Layout.ui with uic.loadUi parses the XML and builds the widgets
+# through uic's loader on every launch. Instead, the .ui file is compiled once into a Python module
+# (layout_ui.py) which records the hash of the .ui file it was made from. The window builds itself
+# with that module, and it is only regenerated, the one time uic is imported, when the .ui file changes.
+
+import hashlib
+import importlib
+import io
+import os
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+UI_FILE = os.path.join(os.path.dirname(PACKAGE_DIR), 'New-Line-Art-Designer_Layout.ui')
+LAYOUT_MODULE = 'line_art.layout_ui'
+LAYOUT_FILE = os.path.join(PACKAGE_DIR, 'layout_ui.py')
+
+HASH_PREFIX = '# ui-sha1: '
+
+
+def ui_hash(ui_file=UI_FILE):
+    """A function to return the hash of a .ui file."""
+    with open(ui_file, 'rb') as layout_file:
+        return hashlib.sha1(layout_file.read()).hexdigest()
+
+
+def compiled_hash(layout_file=LAYOUT_FILE):
+    """A function to return the .ui hash recorded in a compiled layout module, or None if there is none."""
+    if not os.path.exists(layout_file):
+        return None
+    with open(layout_file) as compiled:
+        for line in compiled:
+            if line.startswith(HASH_PREFIX):
+                return line[len(HASH_PREFIX):].strip()
+            if not line.startswith('#'):
+                return None
+    return None
+
+
+def compile_layout(ui_file=UI_FILE):
+    """A function to return the source of the layout module for a .ui file."""
+    from PyQt5 import uic
+
+    source = io.StringIO()
+    uic.compileUi(ui_file, source)
+    return (f"# Generated from {os.path.basename(ui_file)} by line_art.layout. Do not edit: it is\n"
+            f"# regenerated whenever the .ui file changes.\n"
+            f"{HASH_PREFIX}{ui_hash(ui_file)}\n"
+            + source.getvalue().replace(ui_file, os.path.basename(ui_file)))
+
+
+def layout_class():
+    """A function to return the compiled layout class (Ui_Form), regenerating its module if the .ui file changed.
+
+    If the module cannot be written (a read-only install), the layout is compiled in memory instead.
+    """
+    if compiled_hash() != ui_hash():
+        source = compile_layout()
+        try:
+            with open(LAYOUT_FILE, 'w') as layout_file:
+                layout_file.write(source)
+        except OSError:
+            namespace = {}
+            exec(compile(source, LAYOUT_FILE, 'exec'), namespace)
+            return namespace['Ui_Form']
+        importlib.invalidate_caches()
+    return importlib.import_module(LAYOUT_MODULE).Ui_Form
+
+
+def setup_layout(widget):
+    """A function to build the window layout onto widget. Returns the layout object holding its child widgets."""
+    layout = layout_class()()
+    layout.setupUi(widget)
+    return layout
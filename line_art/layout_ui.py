@@ -0,0 +1,48 @@
+# Generated from New-Line-Art-Designer_Layout.ui by line_art.layout. Do not edit: it is
+# regenerated whenever the .ui file changes.
+# ui-sha1: d38444d22bd5aaee4ac15a85f53ca7272051b0f3
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'New-Line-Art-Designer_Layout.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        Form.setObjectName("Form")
+        Form.resize(1920, 997)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Maximum, QtWidgets.QSizePolicy.Maximum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(Form.sizePolicy().hasHeightForWidth())
+        Form.setSizePolicy(sizePolicy)
+        Form.setMinimumSize(QtCore.QSize(600, 800))
+        Form.setLayoutDirection(QtCore.Qt.LeftToRight)
+        Form.setStyleSheet("background-color: rgb(10, 10, 10);")
+        self.graphicsView = QtWidgets.QGraphicsView(Form)
+        self.graphicsView.setGeometry(QtCore.QRect(0, 2, 1915, 1001))
+        self.graphicsView.setMinimumSize(QtCore.QSize(800, 800))
+        self.graphicsView.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.graphicsView.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.graphicsView.setObjectName("graphicsView")
+        self.text_label = QtWidgets.QLabel(Form)
+        self.text_label.setGeometry(QtCore.QRect(10, 830, 441, 151))
+        self.text_label.setStyleSheet("font: 6.5pt \"MS Shell Dlg 2\";\n"
+"background-color: rgba(255, 255, 255, 0);\n"
+"color: rgb(189, 189, 189);")
+        self.text_label.setText("")
+        self.text_label.setObjectName("text_label")
+
+        self.retranslateUi(Form)
+        QtCore.QMetaObject.connectSlotsByName(Form)
+
+    def retranslateUi(self, Form):
+        _translate = QtCore.QCoreApplication.translate
+        Form.setWindowTitle(_translate("Form", "Form"))
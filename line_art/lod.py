@@ -0,0 +1,151 @@
+# lod.py - Adaptive level of detail for the design.
+# The number of rectangles grows quadratically with rect_count, so a few presses of W can push a
+# frame past its budget. The controller watches frame times and steps down through the levels below
+# while frames are over budget, then steps back up once there is headroom again.
+
+
+class DetailLevel:
+    """A class for one level of detail: how much of the design is drawn, and how."""
+
+    def __init__(self, name, column_stride, max_line_thickness, antialias, render_scale=1.0):
+        """A method to describe a level.
+
+        Only every column_stride-th rectangle of each row is drawn, line thickness is clamped to
+        max_line_thickness (None for no clamp), and antialiasing is only kept where antialias is True.
+        Backends that render offscreen draw at render_scale times the resolution and upscale the result.
+        """
+        self.name = name
+        self.column_stride = column_stride
+        self.max_line_thickness = max_line_thickness
+        self.antialias = antialias
+        self.render_scale = render_scale
+
+    def line_thickness(self, line_thickness):
+        """A method to return the line thickness drawn at this level."""
+        if self.max_line_thickness is None:
+            return line_thickness
+        return min(line_thickness, self.max_line_thickness)
+
+
+# From full detail to the cheapest level, each costing less to draw than the one before
+LEVELS = (
+    DetailLevel('Full', 1, None, True),
+    DetailLevel('No antialiasing', 1, None, False),
+    DetailLevel('Thin lines', 1, 2, False),
+    DetailLevel('1/2 columns', 2, 1, False),
+    DetailLevel('1/3 columns', 3, 1, False),
+    DetailLevel('1/4 columns', 4, 1, False)
+)
+
+# The levels of backends that can render at a reduced resolution. Lowering the resolution keeps the
+# whole design, so it comes before thinner lines and fewer columns.
+SCALED_LEVELS = (
+    DetailLevel('Full', 1, None, True),
+    DetailLevel('No antialiasing', 1, None, False),
+    DetailLevel('3/4 resolution', 1, None, False, 0.75),
+    DetailLevel('1/2 resolution', 1, None, False, 0.5),
+    DetailLevel('1/2 resolution, thin lines', 1, 2, False, 0.5),
+    DetailLevel('1/2 resolution, 1/2 columns', 2, 1, False, 0.5),
+    DetailLevel('1/2 resolution, 1/4 columns', 4, 1, False, 0.5)
+)
+
+
+def levels_for(antialias, render_scaling=False):
+    """A function to return the levels worth stepping through for a design drawn with or without antialiasing.
+
+    When the design is not antialiased to begin with, the level that only turns it off is skipped.
+    With render_scaling, the levels lower the resolution before anything else.
+    """
+    levels = SCALED_LEVELS if render_scaling else LEVELS
+    if antialias:
+        return levels
+    return levels[:1] + tuple(level for level in levels[1:]
+                              if level.column_stride > 1 or level.max_line_thickness is not None
+                              or level.render_scale < 1)
+
+
+class DetailController:
+    """A class to choose the level of detail from recent frame times."""
+
+    def __init__(self, target_fps=60, levels=LEVELS, over_budget=1.0, headroom=0.6,
+                 degrade_frames=10, restore_frames=90, smoothing=0.2):
+        """A method to set up the controller at full detail.
+
+        A frame is over budget when the smoothed frame time exceeds over_budget times the frame
+        interval, and has headroom when it is below headroom times the interval. The level drops
+        after degrade_frames over-budget frames in a row and rises after restore_frames frames of
+        headroom in a row, so the level does not flicker between two neighbours.
+        """
+        self.levels = levels
+        self.over_budget = over_budget
+        self.headroom = headroom
+        self.degrade_frames = degrade_frames
+        self.restore_frames = restore_frames
+        self.smoothing = smoothing
+        self.enabled = True
+        self.set_target_fps(target_fps)
+        self.reset()
+
+    def set_target_fps(self, target_fps):
+        """A method to change the frame rate the budget is measured against."""
+        self.budget_ms = 1000 / target_fps
+
+    def reset(self):
+        """A method to return to full detail and forget the measured frame times."""
+        self.index = 0
+        self.average_ms = None
+        self.over_count = 0
+        self.headroom_count = 0
+
+    @property
+    def level(self):
+        """The current DetailLevel, full detail while the controller is disabled."""
+        return self.levels[self.index] if self.enabled else self.levels[0]
+
+    def record(self, frame_ms):
+        """A method to feed the time of a finished frame. Returns True if the level changed."""
+        if not self.enabled:
+            return False
+
+        if self.average_ms is None:
+            self.average_ms = frame_ms
+        else:
+            self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+
+        if self.average_ms > self.budget_ms * self.over_budget:
+            self.over_count += 1
+            self.headroom_count = 0
+        elif self.average_ms < self.budget_ms * self.headroom:
+            self.headroom_count += 1
+            self.over_count = 0
+        else:
+            self.over_count = 0
+            self.headroom_count = 0
+
+        if self.over_count >= self.degrade_frames and self.index < len(self.levels) - 1:
+            self.change_level(self.index + 1)
+            return True
+        if self.headroom_count >= self.restore_frames and self.index > 0:
+            self.change_level(self.index - 1)
+            return True
+        return False
+
+    def change_level(self, index):
+        """A method to move to another level and let the frame times settle before judging it."""
+        self.index = index
+        self.average_ms = None
+        self.over_count = 0
+        self.headroom_count = 0
+
+    def toggle(self):
+        """A method to switch adaptive detail on or off. Turning it off restores full detail."""
+        self.enabled = not self.enabled
+        self.reset()
+
+    def hud_text(self):
+        """A method to format the current level for the HUD overlay."""
+        if not self.enabled:
+            return "LOD off"
+        average = f"{self.average_ms:.2f}" if self.average_ms is not None else "-"
+        return (f"LOD {self.index}/{len(self.levels) - 1} {self.level.name}"
+                f"   avg {average} / {self.budget_ms:.2f} ms")
@@ -0,0 +1,139 @@
+# palette.py - Color gradients and precomputed pen tables for the design.
+# Gradients are loaded from palettes.json and may have any number of stops, interpolated in RGB,
+# HSV or OKLab. Each row i of the design shares one color, so colors and QPens are computed once per
+# (gradient, rect_count, line_thickness) and shared by every rectangle of the row.
+
+import colorsys
+import json
+import os
+from functools import lru_cache
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPen
+
+PALETTE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'palettes.json')
+
+COLOR_SPACES = ('rgb', 'hsv', 'oklab')
+
+
+def srgb_to_linear(channel):
+    """A function to convert an sRGB channel in 0-1 to linear light."""
+    if channel <= 0.04045:
+        return channel / 12.92
+    return ((channel + 0.055) / 1.055) ** 2.4
+
+
+def linear_to_srgb(channel):
+    """A function to convert a linear light channel in 0-1 to sRGB."""
+    if channel <= 0.0031308:
+        return channel * 12.92
+    return 1.055 * channel ** (1 / 2.4) - 0.055
+
+
+def rgb_to_oklab(color):
+    """A function to convert an (r, g, b) color in 0-255 to OKLab."""
+    r, g, b = (srgb_to_linear(channel / 255) for channel in color)
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+            1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+            0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s)
+
+
+def oklab_to_rgb(lab):
+    """A function to convert an OKLab color to (r, g, b) in 0-255."""
+    lightness, a, b = lab
+    l = (lightness + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (lightness - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (lightness - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    linear = (4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+              -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+              -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s)
+    return tuple(255 * linear_to_srgb(min(max(channel, 0.0), 1.0)) for channel in linear)
+
+
+def mix(start, end, t):
+    """A function to linearly interpolate between two tuples."""
+    return tuple(a + (b - a) * t for a, b in zip(start, end))
+
+
+class Gradient:
+    """A class for a multi-stop color gradient."""
+
+    def __init__(self, name, stops, space='rgb'):
+        """A method to create a gradient from (position, (r, g, b)) stops with positions in 0-1."""
+        if space not in COLOR_SPACES:
+            raise ValueError(f"Gradient '{name}' has unknown color space '{space}', expected one of {COLOR_SPACES}")
+        if len(stops) < 2:
+            raise ValueError(f"Gradient '{name}' needs at least two stops")
+
+        self.name = name
+        self.space = space
+        self.stops = sorted((float(position), tuple(color)) for position, color in stops)
+
+    def color_at(self, t):
+        """A method to return the (r, g, b) color at position t, as floats in 0-255."""
+        t = min(max(t, self.stops[0][0]), self.stops[-1][0])
+        for (start_pos, start_color), (end_pos, end_color) in zip(self.stops, self.stops[1:]):
+            if t <= end_pos:
+                break
+        local_t = (t - start_pos) / (end_pos - start_pos) if end_pos > start_pos else 0.0
+
+        if self.space == 'hsv':
+            start_hsv = colorsys.rgb_to_hsv(*(channel / 255 for channel in start_color))
+            end_hsv = colorsys.rgb_to_hsv(*(channel / 255 for channel in end_color))
+            # Hue takes the short way around the color wheel
+            hue_delta = (end_hsv[0] - start_hsv[0] + 0.5) % 1.0 - 0.5
+            hue = (start_hsv[0] + hue_delta * local_t) % 1.0
+            saturation, value = mix(start_hsv[1:], end_hsv[1:], local_t)
+            return tuple(255 * channel for channel in colorsys.hsv_to_rgb(hue, saturation, value))
+        if self.space == 'oklab':
+            return oklab_to_rgb(mix(rgb_to_oklab(start_color), rgb_to_oklab(end_color), local_t))
+        return mix(start_color, end_color, local_t)
+
+
+# The design's original ramp, used when palettes.json is missing
+DEFAULT_GRADIENT = Gradient('Classic', [(0, (140, 255, 140)), (1, (5, 55, 140))])
+
+
+def load_gradients(path=PALETTE_FILE):
+    """A function to load the gradients from a palette file.
+
+    The file holds {"gradients": [{"name": ..., "space": "rgb" | "hsv" | "oklab",
+    "stops": [[position, [r, g, b]], ...]}, ...]}. The first gradient is the default.
+    """
+    if not os.path.exists(path):
+        return [DEFAULT_GRADIENT]
+
+    with open(path) as palette_file:
+        config = json.load(palette_file)
+
+    gradients = [Gradient(entry['name'], entry['stops'], entry.get('space', 'rgb'))
+                 for entry in config.get('gradients', [])]
+    return gradients or [DEFAULT_GRADIENT]
+
+
+def find_gradient(gradients, name):
+    """A function to return the gradient with the given name."""
+    for gradient in gradients:
+        if gradient.name == name:
+            return gradient
+    raise ValueError(f"Unknown palette '{name}', expected one of {[gradient.name for gradient in gradients]}")
+
+
+@lru_cache(maxsize=64)
+def color_table(gradient, rect_count):
+    """A function to return the rect_count + 1 row colors of a gradient as (r, g, b) integer tuples.
+
+    Channels are truncated like the original ramp, after rounding away color conversion noise.
+    """
+    return tuple(tuple(int(round(channel, 6)) for channel in gradient.color_at(k / rect_count))
+                 for k in range(rect_count + 1))
+
+
+@lru_cache(maxsize=64)
+def pen_table(gradient, rect_count, line_thickness):
+    """A function to return one shared QPen per row color of a gradient."""
+    return tuple(QPen(QColor(*color), line_thickness, Qt.SolidLine)
+                 for color in color_table(gradient, rect_count))
@@ -0,0 +1,85 @@
+# params.py - The parameter set that fully describes a frame of the design.
+# The GUI, the offscreen renderer and the export tools all describe a frame the same way, so a
+# frame is a pure function of a DesignParams and the image width it is drawn at.
+
+# The animation's fixed simulation rate, and how far the starting point moves per simulation step
+# (one speed step per row of the default 13-rectangle design).
+SIMULATION_RATE = 60
+ROW_STEPS_PER_STEP = 12
+
+DEFAULT_OP_LIST = ('/', '-', '/', '/', '-', '+', '+')
+DEFAULT_TRIG_NAMES = ('None',) * 13
+OP_OPTIONS = ('+', '-', '*', '/')
+TRIG_OPTIONS = ('None', 'Sine', 'Cosine', 'Tangent')
+
+# Direction of movement: forward, backward, or paused
+FORWARD = 1
+BACKWARD = -1
+PAUSED = 0
+
+
+class DesignParams:
+    """A class to hold the values that determine a frame of the design."""
+
+    FIELDS = ('starting_point', 'speed', 'rect_width', 'rect_count', 'prox_to_center',
+              'line_thickness', 'op_list', 'trig_names', 'palette', 'direction')
+
+    def __init__(self, starting_point=1, speed=0.01, rect_width=100, rect_count=13, prox_to_center=4,
+                 line_thickness=1, op_list=DEFAULT_OP_LIST, trig_names=DEFAULT_TRIG_NAMES,
+                 palette='Classic', direction=FORWARD):
+        self.starting_point = starting_point
+        self.speed = speed
+        self.rect_width = rect_width
+        self.rect_count = rect_count
+        self.prox_to_center = prox_to_center
+        self.line_thickness = line_thickness
+        self.op_list = tuple(op_list)
+        self.trig_names = tuple(trig_names)
+        self.palette = palette
+        self.direction = direction
+
+        if len(self.op_list) != 7 or any(op not in OP_OPTIONS for op in self.op_list):
+            raise ValueError(f"op_list must be 7 operators from {OP_OPTIONS}, got {self.op_list}")
+        if len(self.trig_names) != 13 or any(name not in TRIG_OPTIONS for name in self.trig_names):
+            raise ValueError(f"trig_names must be 13 names from {TRIG_OPTIONS}, got {self.trig_names}")
+        if self.rect_count < 1:
+            raise ValueError(f"rect_count must be at least 1, got {self.rect_count}")
+
+    def __eq__(self, other):
+        return isinstance(other, DesignParams) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"DesignParams({', '.join(f'{field}={getattr(self, field)!r}' for field in self.FIELDS)})"
+
+    def to_dict(self):
+        """A method to return the parameters as a JSON-friendly dictionary."""
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values['op_list'] = list(self.op_list)
+        values['trig_names'] = list(self.trig_names)
+        return values
+
+    @classmethod
+    def from_dict(cls, values):
+        """A method to build parameters from a dictionary, with missing fields left at their defaults."""
+        unknown = set(values) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown design parameters: {', '.join(sorted(unknown))}")
+        return cls(**values)
+
+    def copy(self, **changes):
+        """A method to return a copy with some fields changed."""
+        values = self.to_dict()
+        values.update(changes)
+        return DesignParams(**values)
+
+    def key(self):
+        """A method to return a hashable key of everything but the starting point."""
+        return tuple(getattr(self, field) for field in self.FIELDS if field != 'starting_point')
+
+    def row_step(self):
+        """A method to return how far the starting point is staggered between rows of a frame."""
+        return self.speed * self.direction
+
+    def point_after(self, steps):
+        """A method to return the starting point after a number of simulation steps (may be fractional)."""
+        return self.starting_point + steps * ROW_STEPS_PER_STEP * self.speed * self.direction
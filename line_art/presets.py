@@ -0,0 +1,141 @@
+# presets.py - A bank of saved design configurations.
+# Presets are kept in presets.json next to palettes.json, and the window binds them to F1-F12.
+# Switching looks mid-show must not hitch, so everything a preset needs is warmed up before the
+# swap: the compiled expression and slot layout on a background thread, and the Qt objects
+# (pens, spare scene items) on the GUI thread, where they have to be created.
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from line_art.expression import compile_design
+from line_art.geometry import frame_for
+from line_art.palette import load_gradients
+from line_art.params import DesignParams, FORWARD
+
+PRESET_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'presets.json')
+
+# The fields a preset holds. Where the design is and which way it moves stay as they are when switching.
+PRESET_FIELDS = tuple(field for field in DesignParams.FIELDS if field not in ('starting_point', 'direction'))
+
+# The number of key-bound slots in the bank (F1-F12)
+BANK_SIZE = 12
+
+# Presets are checked to draw something at the export tools' default image width
+CHECK_WIDTH = 1920
+
+
+class Preset:
+    """A class for a named design configuration."""
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params
+
+    def to_dict(self):
+        """A method to return the preset in the presets.json schema."""
+        values = self.params.to_dict()
+        return {'name': self.name, **{field: values[field] for field in PRESET_FIELDS}}
+
+    @classmethod
+    def from_dict(cls, values):
+        """A method to build a preset from the presets.json schema. Missing fields take their defaults.
+
+        op_list may be given as a string such as "/-//-++" as well as a list.
+        """
+        values = dict(values)
+        name = values.pop('name')
+        unknown = set(values) - set(PRESET_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields in preset '{name}': {', '.join(sorted(unknown))}")
+        if isinstance(values.get('op_list'), str):
+            values['op_list'] = list(values['op_list'])
+        return cls(name, DesignParams.from_dict(values))
+
+    def applied_to(self, params):
+        """A method to return params with this preset's fields, keeping its starting point and direction."""
+        return self.params.copy(starting_point=params.starting_point, direction=params.direction)
+
+
+def load_presets(path=PRESET_FILE, gradients=None):
+    """A function to load the bank from a preset file.
+
+    The file holds {"presets": [{"name": ..., "speed": ..., "rect_width": ..., "rect_count": ...,
+    "prox_to_center": ..., "line_thickness": ..., "op_list": ..., "trig_names": [...],
+    "palette": ...}, ...]}, in key order (the first is F1). Missing files give an empty bank.
+    A null entry leaves its key empty (None in the bank), and so does a preset that cannot be read
+    or fails check_preset against gradients (by default, those of palettes.json), which is reported
+    on stderr. The other presets keep their keys.
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path) as preset_file:
+        config = json.load(preset_file)
+    gradients = gradients or load_gradients()
+    presets = []
+    for index, entry in enumerate(config.get('presets', [])[:BANK_SIZE]):
+        preset = None
+        if entry is not None:
+            try:
+                preset = Preset.from_dict(entry)
+                check_preset(preset, gradients)
+            except (KeyError, TypeError, ValueError) as error:
+                print(f"Skipping the F{index + 1} preset of {path}: {error}", file=sys.stderr)
+                preset = None
+        presets.append(preset)
+    return presets
+
+
+def check_preset(preset, gradients, image_width=CHECK_WIDTH):
+    """A function to raise ValueError if a preset names a palette not in gradients, or draws no visible
+    rectangle at its starting point.
+    """
+    names = [gradient.name for gradient in gradients]
+    if preset.params.palette not in names:
+        raise ValueError(f"Preset '{preset.name}' uses an unknown palette '{preset.params.palette}', "
+                         f"expected one of {names}")
+    if len(frame_for(preset.params, image_width)) == 0:
+        raise ValueError(f"Preset '{preset.name}' draws no visible rectangles at an image width of {image_width}")
+
+
+def save_presets(presets, path=PRESET_FILE):
+    """A function to write the bank to a preset file.
+
+    Empty keys keep the entry the file already has for them, so a preset skipped by load_presets is
+    not lost by saving another one.
+    """
+    entries = []
+    if os.path.exists(path):
+        with open(path) as preset_file:
+            entries = json.load(preset_file).get('presets', [])
+    entries = [preset.to_dict() if preset is not None else (entries[index] if index < len(entries) else None)
+               for index, preset in enumerate(presets)]
+    with open(path, 'w') as preset_file:
+        json.dump({'presets': entries}, preset_file, indent=2)
+        preset_file.write('\n')
+
+
+def warm_geometry(params, image_width):
+    """A function to evaluate a frame of params once, filling the expression and slot layout caches.
+
+    Both the moving and the paused forms of the expression are compiled.
+    """
+    frame_for(params.copy(direction=FORWARD), image_width)
+    compile_design(params.op_list, params.trig_names, False)
+
+
+class PresetWarmer:
+    """A class to warm up the geometry of presets on a background thread."""
+
+    def __init__(self, image_width):
+        self.image_width = image_width
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='preset-warmer')
+
+    def warm(self, params):
+        """A method to start warming up params and return a future that completes when it is done."""
+        return self.executor.submit(warm_geometry, params, self.image_width)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
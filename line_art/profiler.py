@@ -0,0 +1,131 @@
+# profiler.py - Per-frame timing of the design's pipeline stages.
+# Every frame records how long each stage took along with the rectangle and scene item counts.
+# The last few seconds are kept in a ring buffer, summarized for the HUD overlay, and can be
+# exported as CSV or as a Chrome trace (chrome://tracing or https://ui.perfetto.dev).
+
+import csv
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# The stages of a frame, in the order they run
+STAGES = ('background', 'colors', 'design', 'stats', 'paint')
+
+
+class FrameRecord:
+    """A class for the timings of one frame."""
+
+    def __init__(self, index, start_ns):
+        self.index = index
+        self.start_ns = start_ns
+        self.stages = []
+        self.rect_count = 0
+        self.item_count = 0
+        self.culled_count = 0
+
+    def stage_ms(self, name):
+        """A method to return the total time spent in a stage, in milliseconds."""
+        return sum(duration for stage, start, duration in self.stages if stage == name) / 1000000
+
+    def total_ms(self):
+        """A method to return the time spent in all stages, in milliseconds."""
+        return sum(duration for stage, start, duration in self.stages) / 1000000
+
+
+def percentile(values, fraction):
+    """A function to return the value below which the given fraction of sorted values fall."""
+    if not values:
+        return 0.0
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+class FrameProfiler:
+    """A class to collect frame records in a ring buffer and summarize them."""
+
+    def __init__(self, capacity=600):
+        self.records = deque(maxlen=capacity)
+        self.current = None
+        self.frame_index = 0
+
+    def begin_frame(self):
+        """A method to start a new frame record. Stages timed until the next call belong to it."""
+        self.current = FrameRecord(self.frame_index, time.perf_counter_ns())
+        self.records.append(self.current)
+        self.frame_index += 1
+
+    @contextmanager
+    def stage(self, name):
+        """A method to time a block of code as a stage of the current frame."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            if self.current is not None:
+                self.current.stages.append((name, start, time.perf_counter_ns() - start))
+
+    def set_counts(self, rect_count, item_count, culled_count=0):
+        """A method to record the drawn rectangle, scene item and culled rectangle counts of the current frame."""
+        if self.current is not None:
+            self.current.rect_count = rect_count
+            self.current.item_count = item_count
+            self.current.culled_count = culled_count
+
+    def summary(self):
+        """A method to summarize the buffered frames for the HUD."""
+        records = list(self.records)
+        if len(records) < 2:
+            return None
+
+        span_ns = records[-1].start_ns - records[0].start_ns
+        totals = sorted(record.total_ms() for record in records)
+        return {
+            'fps': (len(records) - 1) * 1000000000 / span_ns if span_ns else 0.0,
+            'p50': percentile(totals, 0.50),
+            'p95': percentile(totals, 0.95),
+            'p99': percentile(totals, 0.99),
+            'stages': {name: sum(record.stage_ms(name) for record in records) / len(records) for name in STAGES},
+            'rect_count': records[-1].rect_count,
+            'item_count': records[-1].item_count,
+            'culled_count': records[-1].culled_count
+        }
+
+    def hud_text(self):
+        """A method to format the summary as the lines of the HUD overlay."""
+        summary = self.summary()
+        if summary is None:
+            return "Collecting frames..."
+
+        lines = [f"FPS {summary['fps']:6.1f}",
+                 f"Frame ms  p50 {summary['p50']:6.2f}  p95 {summary['p95']:6.2f}  p99 {summary['p99']:6.2f}"]
+        for name in STAGES:
+            lines.append(f"  {name:<11}{summary['stages'][name]:7.2f} ms")
+        lines.append(f"Rectangles {summary['rect_count']}   Culled {summary['culled_count']}"
+                     f"   Scene items {summary['item_count']}")
+        return "\n".join(lines)
+
+    def export_csv(self, path):
+        """A method to write one row per buffered frame with the time of every stage."""
+        with open(path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['frame', 'start_ms', 'total_ms'] + [f"{name}_ms" for name in STAGES]
+                            + ['rect_count', 'item_count', 'culled_count'])
+            for record in self.records:
+                writer.writerow([record.index, record.start_ns / 1000000, record.total_ms()]
+                                + [record.stage_ms(name) for name in STAGES]
+                                + [record.rect_count, record.item_count, record.culled_count])
+
+    def export_chrome_trace(self, path):
+        """A method to write the buffered frames in the Chrome trace event format."""
+        events = []
+        for record in self.records:
+            for name, start, duration in record.stages:
+                events.append({'name': name, 'cat': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                               'ts': start / 1000, 'dur': duration / 1000,
+                               'args': {'frame': record.index}})
+            events.append({'name': 'counts', 'ph': 'C', 'pid': 1, 'ts': record.start_ns / 1000,
+                           'args': {'rectangles': record.rect_count, 'scene items': record.item_count,
+                                    'culled': record.culled_count}})
+
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
@@ -0,0 +1,170 @@
+# recording.py - Recording a live session and replaying it offline.
+# Every key press handled by the window is appended to a compact binary log with its timestamp and
+# the design parameters it resulted in. Since the animation between two key presses only depends on
+# those parameters and the time passed, the log reconstructs the whole performance, and can be
+# re-rendered at any frame rate or resolution. The design is laid out at the window size the show ran
+# at, which the log keeps, and scaled to the output size:
+#
+#   python -m line_art.recording recordings/session.lartrec --fps 60 --width 3840 --height 2160 --out frames/
+#
+# Log layout: the MAGIC header and the window's HEADER_FORMAT, then one record per event:
+# EVENT_FORMAT, 7 operator indices, 13 trig function indices, and the palette name as a
+# length-prefixed UTF-8 string. Logs with the older MAGIC_V1 header have no window size.
+
+import argparse
+import struct
+import sys
+import time
+from bisect import bisect_right
+
+from line_art.params import DesignParams, OP_OPTIONS, TRIG_OPTIONS, SIMULATION_RATE
+
+MAGIC = b'LARTREC2'
+MAGIC_V1 = b'LARTREC1'
+
+# image_width, height of the window
+HEADER_FORMAT = '<II'
+
+# time_ms, key, starting_point, speed, rect_width, rect_count, prox_to_center, line_thickness, direction
+EVENT_FORMAT = '<dIdddIiib'
+EVENT_SIZE = struct.calcsize(EVENT_FORMAT)
+OPS_SIZE = 7
+TRIGS_SIZE = 13
+
+
+def pack_event(time_ms, key, params):
+    """A function to encode one event as bytes."""
+    palette = params.palette.encode('utf-8')
+    return (struct.pack(EVENT_FORMAT, time_ms, key, params.starting_point, params.speed, params.rect_width,
+                        params.rect_count, params.prox_to_center, params.line_thickness, params.direction)
+            + bytes(OP_OPTIONS.index(op) for op in params.op_list)
+            + bytes(TRIG_OPTIONS.index(name) for name in params.trig_names)
+            + bytes([len(palette)]) + palette)
+
+
+class Recorder:
+    """A class to append the events of a live session to a log file."""
+
+    def __init__(self, path, image_width, height):
+        """A method to start a new log at path, for a window image_width x height. Times are measured from now."""
+        self.path = path
+        self.log_file = open(path, 'wb')
+        self.log_file.write(MAGIC + struct.pack(HEADER_FORMAT, image_width, height))
+        self.start = time.perf_counter()
+        self.event_count = 0
+
+    def record(self, key, params):
+        """A method to append an event: the key pressed (0 for none) and the parameters that resulted."""
+        time_ms = (time.perf_counter() - self.start) * 1000
+        self.log_file.write(pack_event(time_ms, key, params))
+        # Flushed per event, so a crash during the show loses at most the event being written
+        self.log_file.flush()
+        self.event_count += 1
+
+    def close(self):
+        self.log_file.close()
+
+
+class Recording:
+    """A class for the events of a recorded session, which give the design parameters at any time."""
+
+    def __init__(self, events, image_width=None, height=None):
+        """A method to hold a list of (time_ms, key, DesignParams) events, in time order.
+
+        image_width and height are the size of the window the session was recorded in, if known.
+        """
+        if not events:
+            raise ValueError("A recording needs at least one event")
+        self.events = events
+        self.image_width = image_width
+        self.height = height
+        self.times = [event[0] for event in events]
+
+    def params_at(self, time_ms):
+        """A method to return the design parameters at time_ms after the recording started."""
+        index = max(bisect_right(self.times, time_ms) - 1, 0)
+        event_time, key, params = self.events[index]
+        steps = (time_ms - event_time) * SIMULATION_RATE / 1000
+        return params.copy(starting_point=params.point_after(max(steps, 0)))
+
+    def frame_params(self, frame, fps):
+        """A method to return the parameters of frame number `frame` of the replay played at fps."""
+        return self.params_at(frame * 1000 / fps)
+
+    def duration_ms(self):
+        return self.times[-1]
+
+    def frame_count(self, fps):
+        """A method to return how many frames at fps cover the recording, up to its last event."""
+        return int(self.duration_ms() * fps / 1000) + 1
+
+
+def read_recording(path):
+    """A function to read a log written by a Recorder.
+
+    A record cut short at the end of the file (the recorder was killed mid-write) is ignored.
+    """
+    with open(path, 'rb') as log_file:
+        data = log_file.read()
+    image_width = height = None
+    if data.startswith(MAGIC):
+        image_width, height = struct.unpack_from(HEADER_FORMAT, data, len(MAGIC))
+        offset = len(MAGIC) + struct.calcsize(HEADER_FORMAT)
+    elif data.startswith(MAGIC_V1):
+        offset = len(MAGIC_V1)
+    else:
+        raise ValueError(f"{path} is not a line art recording")
+
+    events = []
+    while offset + EVENT_SIZE + OPS_SIZE + TRIGS_SIZE + 1 <= len(data):
+        (time_ms, key, starting_point, speed, rect_width, rect_count, prox_to_center, line_thickness,
+         direction) = struct.unpack_from(EVENT_FORMAT, data, offset)
+        offset += EVENT_SIZE
+        op_list = [OP_OPTIONS[index] for index in data[offset:offset + OPS_SIZE]]
+        offset += OPS_SIZE
+        trig_names = [TRIG_OPTIONS[index] for index in data[offset:offset + TRIGS_SIZE]]
+        offset += TRIGS_SIZE
+        palette_size = data[offset]
+        offset += 1
+        if offset + palette_size > len(data):
+            break
+        palette = data[offset:offset + palette_size].decode('utf-8')
+        offset += palette_size
+
+        events.append((time_ms, key, DesignParams(starting_point, speed, rect_width, rect_count, prox_to_center,
+                                                  line_thickness, op_list, trig_names, palette, direction)))
+    return Recording(events, image_width, height)
+
+
+def main(argv=None):
+    from line_art.export import add_output_arguments, parse_frame_range, write_output
+
+    parser = argparse.ArgumentParser(description="Re-render a recorded session without a window.")
+    parser.add_argument('recording', help="log written by the window (U starts and stops recording)")
+    parser.add_argument('--frames', type=parse_frame_range, help="frame range first:last (default: all)")
+    parser.add_argument('--fps', type=float, default=60, help="frame rate to replay at")
+    parser.add_argument('--width', type=int, help="output width (default: the recorded window's, or 1920)")
+    parser.add_argument('--height', type=int,
+                        help="output height (default: from the recorded window's aspect, or 1080)")
+    parser.add_argument('--antialias', action='store_true')
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes to render with, 0 for one per core")
+    parser.add_argument('--chunk-size', type=int, default=2, help="frames handed to a worker at a time")
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+
+    recording = read_recording(args.recording)
+    # Older logs have no window size, and are laid out for the output width
+    design_width = recording.image_width
+    if args.width is None:
+        args.width = design_width or 1920
+    if args.height is None:
+        args.height = round(recording.height * args.width / design_width) if design_width else 1080
+    first, last = args.frames or (0, recording.frame_count(args.fps))
+    print(f"Replaying {len(recording.events)} events, frames {first}:{last} at {args.fps:g} fps, "
+          f"{args.width}x{args.height} from a {design_width or args.width} wide window", file=sys.stderr)
+
+    write_output(recording, first, last, args, design_width)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+# render.py - Drawing the design with a plain QPainter.
+# Used to render frames without a window, and by the GUI's immediate-mode backend: the same
+# background and rectangles the QGraphicsScene shows are painted straight onto a QImage.
+
+from PyQt5.QtCore import Qt, QPoint, QRectF
+from PyQt5.QtGui import QBrush, QColor, QImage, QLinearGradient, QPainter, QPen, QTransform
+
+from line_art.geometry import frame_for
+from line_art.palette import find_gradient, load_gradients, pen_table
+
+# The window's own background color, from the layout's stylesheet
+WINDOW_COLOR = QColor(10, 10, 10)
+
+
+def background_brush(image_width, stripe_count=4):
+    """A function to build the striped background gradient of the design."""
+
+    grad = QLinearGradient(QPoint(image_width, 0), QPoint(image_width, image_width))
+
+    bg_start_colors = [30, 5, 5]
+    bg_end_colors = [15, 5, 35]
+
+    gradient_position = 0
+    grad_pos_inc = 1.0 / stripe_count
+    for i in range(stripe_count + 1):
+        grad.setColorAt(gradient_position if gradient_position <= 1 else 1,
+                        QColor(bg_start_colors[0], bg_start_colors[1], bg_start_colors[2]))
+        gradient_position += grad_pos_inc / 2
+        grad.setColorAt(gradient_position if gradient_position <= 1 else 1,
+                        QColor(bg_end_colors[0], bg_end_colors[1], bg_end_colors[2]))
+        gradient_position += grad_pos_inc / 2
+
+    return QBrush(grad)
+
+
+def draw_frame(painter, frame, pens, image_half):
+    """A function to paint every rectangle of a frame, using the same transforms as the scene items.
+
+    Rows are painted in order, each over the rows before it, just as the scene stacks them. Within a
+    row, which shares one pen, rectangles that share a rotation are drawn under one painter transform
+    with one drawRects call, instead of one transform and one draw call per rectangle. The frame's
+    angles are reduced to one turn (see geometry.slot_angles), so rectangles whole turns apart share a
+    group.
+    """
+    # The frame's rows are contiguous and in order, so the groups are inserted row by row
+    rows = {}
+    for row, x, y, width, height, angle in zip(frame.rows.astype(int).tolist(), frame.x.tolist(),
+                                               frame.y.tolist(), frame.width.tolist(),
+                                               frame.height.tolist(), frame.angle.tolist()):
+        rows.setdefault(row, {}).setdefault(angle, []).append(QRectF(x, y, width, height))
+
+    base = painter.transform()
+    transforms = {}
+    for row, angles in rows.items():
+        painter.setPen(pens[row])
+        for angle, rects in angles.items():
+            transform = transforms.get(angle)
+            if transform is None:
+                transform = QTransform(base)
+                transform.translate(image_half, image_half / 2)
+                transform.rotate(angle)
+                transforms[angle] = transform
+            painter.setTransform(transform)
+            painter.drawRects(rects)
+    painter.setTransform(base)
+
+
+class OffscreenRenderer:
+    """A class to render frames of the design into a reusable QImage, without a window."""
+
+    def __init__(self, width, height, gradients=None, antialias=False, stripe_count=4, frame_cache=None,
+                 scale=1.0):
+        """A method to set up a width x height render target.
+
+        The design is laid out for an image_width of `width`, and the middle `height` rows of the
+        square scene are kept, just as the GUI's view shows them. Frames are looked up in
+        frame_cache (a line_art.frame_cache.FrameCache) when one is given.
+        With a scale below 1, the same design is drawn into an image of scale times the size, to be
+        upscaled by whoever shows it. The geometry stays in the units of the full-size design.
+        """
+        self.width = width
+        self.height = height
+        self.antialias = antialias
+        self.gradients = gradients or load_gradients()
+        self.brush = background_brush(width, stripe_count)
+        self.scale = None
+        self.image = None
+        self.set_scale(scale)
+        self.frame_cache = frame_cache
+        self.last_rect_count = 0
+        self.last_cull_stats = None
+
+    def set_scale(self, scale):
+        """A method to change the render scale, replacing the image if its size changes."""
+        if scale == self.scale:
+            return
+        self.scale = scale
+        image_width = max(round(self.width * scale), 1)
+        image_height = max(round(self.height * scale), 1)
+        if self.image is None or (self.image.width(), self.image.height()) != (image_width, image_height):
+            self.image = QImage(image_width, image_height, QImage.Format_RGB32)
+
+    def use_image(self, image):
+        """A method to render into image, which must have the size of the renderer's own, from now on."""
+        if image.size() != self.image.size():
+            raise ValueError(f"Expected a {self.image.width()}x{self.image.height()} image, "
+                             f"got {image.width()}x{image.height()}")
+        self.image = image
+
+    def begin(self):
+        """A method to clear the image to the background and return a painter set up in scene coordinates."""
+        self.image.fill(WINDOW_COLOR)
+        painter = QPainter(self.image)
+        painter.setRenderHint(QPainter.Antialiasing, self.antialias)
+        painter.scale(self.image.width() / self.width, self.image.height() / self.height)
+        painter.translate(0, -(self.width - self.height) / 2)
+
+        scene_rect = QRectF(0, 0, self.width, self.width)
+        painter.fillRect(scene_rect, self.brush)
+        painter.setPen(QPen(QColor(0, 0, 0), 1))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(scene_rect)
+        return painter
+
+    def render_background(self):
+        """A method to render the background alone and return the (reused) image."""
+        self.begin().end()
+        return self.image
+
+    def render(self, params, column_stride=1, frame=None):
+        """A method to render the frame described by params and return the (reused) image.
+
+        A column_stride above 1 draws only every column_stride-th rectangle of each row. The frame's
+        geometry may be given when it was already evaluated elsewhere.
+        """
+        if frame is None and self.frame_cache is not None:
+            frame = self.frame_cache.frame(params, self.width, column_stride)
+        elif frame is None:
+            frame = frame_for(params, self.width, column_stride)
+        pens = pen_table(find_gradient(self.gradients, params.palette), params.rect_count, params.line_thickness)
+
+        painter = self.begin()
+        draw_frame(painter, frame, pens, int(self.width / 2))
+        painter.end()
+        self.last_rect_count = len(frame)
+        self.last_cull_stats = frame.cull_stats
+        return self.image
+
+    def rgb_bytes(self):
+        """A method to return the current image as tightly packed 8-bit RGB bytes."""
+        rgb = self.image.convertToFormat(QImage.Format_RGB888)
+        bits = rgb.constBits()
+        bits.setsize(rgb.sizeInBytes())
+        data = bytes(bits)
+
+        row_bytes = rgb.width() * 3
+        if rgb.bytesPerLine() == row_bytes:
+            return data
+        return b''.join(data[line * rgb.bytesPerLine():line * rgb.bytesPerLine() + row_bytes]
+                        for line in range(rgb.height()))
@@ -0,0 +1,119 @@
+# soak.py - A soak test for long-running installations.
+# Drives the design window offscreen for thousands of frames while cycling through key presses,
+# and checks that neither the process memory nor the number of scene items keeps growing. The frame
+# cache is meant to grow up to its bound, so the soak gives it a small one, which it fills during
+# warmup: from then on the cache stays full, and any growth of the process is a leak.
+#
+#   python -m line_art.soak --frames 5000
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtGui import QKeyEvent
+from PyQt5.QtWidgets import QApplication
+
+from line_art.designer import load_designer
+
+# Key presses made during every cycle of the soak, by frame within the cycle. Each cycle returns
+# the design to the state it started in, so samples taken at the start of a cycle are comparable.
+CYCLE_LENGTH = 200
+CYCLE_KEYS = {
+    20: Qt.Key_W,
+    40: Qt.Key_Q,
+    60: Qt.Key_X,
+    80: Qt.Key_Z,
+    100: Qt.Key_E,
+    110: Qt.Key_E,
+    120: Qt.Key_E,
+    130: Qt.Key_E,
+    140: Qt.Key_Shift,
+    150: Qt.Key_Space,
+    180: Qt.Key_Space,
+    190: Qt.Key_Shift,
+    195: Qt.Key_Shift
+}
+
+
+def current_rss():
+    """A function to return the resident set size in bytes, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def soak(frames, warmup_cycles=2, rss_tolerance_mb=8.0, cache_mb=2.0):
+    """A function to run the soak and return a list of failure messages (empty when it passes)."""
+    designer = load_designer()
+    q_app = QApplication.instance() or designer['MyApplication'](sys.argv[:1])
+    invention = designer['ArtInvention']()
+    invention.frame_cache.max_bytes = int(cache_mb * 1048576)
+    invention.forward()
+
+    # Adaptive detail would make the scene item count depend on how fast this machine is
+    invention.toggle_adaptive_detail()
+
+    samples = []
+    for frame in range(frames):
+        phase = frame % CYCLE_LENGTH
+        if phase == 0:
+            samples.append((frame, current_rss(), len(invention.scene.items()), len(invention.design_colors),
+                            invention.frame_cache.size))
+        if phase in CYCLE_KEYS:
+            invention.keyPressEvent(QKeyEvent(QEvent.KeyPress, CYCLE_KEYS[phase], Qt.NoModifier))
+            invention.clock.stop()
+
+        invention.advance_design(1)
+        invention.render_frame()
+        q_app.processEvents()
+
+    print(f"{'frame':>8} {'rss (MB)':>10} {'items':>8} {'colors':>8} {'cache (MB)':>11}")
+    for frame, rss, items, colors, cache_size in samples:
+        rss_text = f"{rss / 1048576:.1f}" if rss is not None else 'n/a'
+        print(f"{frame:>8} {rss_text:>10} {items:>8} {colors:>8} {cache_size / 1048576:>11.1f}")
+
+    failures = []
+    steady = samples[warmup_cycles:]
+    if len(steady) < 2:
+        failures.append(f"not enough cycles after warmup, run at least {(warmup_cycles + 2) * CYCLE_LENGTH} frames")
+        return failures
+
+    if len({items for frame, rss, items, colors, cache_size in steady}) != 1:
+        failures.append("scene item count changed between cycles")
+    if len({colors for frame, rss, items, colors, cache_size in steady}) != 1:
+        failures.append("design color list changed size between cycles")
+    if max(cache_size for frame, rss, items, colors, cache_size in samples) > invention.frame_cache.max_bytes:
+        failures.append("frame cache grew past its bound")
+    # A cache still filling up after warmup would be counted as growth below
+    if steady[0][4] < invention.frame_cache.max_bytes / 2:
+        failures.append("frame cache was not full after warmup, lower --cache-mb")
+
+    first_rss = steady[0][1]
+    last_rss = steady[-1][1]
+    if first_rss is not None and last_rss is not None:
+        growth_mb = (last_rss - first_rss) / 1048576
+        if growth_mb > rss_tolerance_mb:
+            failures.append(f"RSS grew by {growth_mb:.1f} MB (tolerance {rss_tolerance_mb} MB)")
+
+    return failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Soak-test the design window offscreen.")
+    parser.add_argument('--frames', type=int, default=5000, help="number of frames to draw")
+    parser.add_argument('--warmup-cycles', type=int, default=2, help="cycles ignored before comparing samples")
+    parser.add_argument('--rss-tolerance-mb', type=float, default=8.0, help="allowed RSS growth after warmup")
+    parser.add_argument('--cache-mb', type=float, default=2.0, help="frame cache bound during the soak")
+    args = parser.parse_args()
+
+    failures = soak(args.frames, args.warmup_cycles, args.rss_tolerance_mb, args.cache_mb)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("PASS: memory and scene item count stayed flat")
+    sys.exit(1 if failures else 0)
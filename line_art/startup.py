@@ -0,0 +1,95 @@
+# startup.py - Measuring how long the window takes to show its first frame.
+# The kiosks launch the designer unattended, so what matters is the time from the process starting
+# to the first frame on screen. The window marks each phase of its startup on a StartupTimer and,
+# when started with --startup-report, prints them once the first frame is painted. Run
+#
+#   python -m line_art.startup --runs 10
+#
+# to launch it repeatedly (offscreen by default) and summarize the reports. The window imports this
+# module before anything else, so what only the launcher needs is imported where it is used.
+
+import os
+import sys
+import time
+
+DESIGNER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'New-Line-Art-Designer.py')
+
+REPORT_PREFIX = 'startup '
+
+
+class StartupTimer:
+    """A class to record the phases of startup, each as the time since the timer was created."""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []
+
+    def mark(self, phase):
+        """A method to record that a phase of startup finished now."""
+        self.marks.append((phase, (time.perf_counter() - self.start) * 1000))
+
+    def done(self, phase):
+        """A method to return whether a phase was marked."""
+        return any(name == phase for name, elapsed_ms in self.marks)
+
+    def report(self):
+        """A method to format the phases, one line each, with their own time and the time since the start."""
+        lines = []
+        previous_ms = 0.0
+        for phase, elapsed_ms in self.marks:
+            lines.append(f"{REPORT_PREFIX}{phase:<12} {elapsed_ms - previous_ms:8.1f} ms  {elapsed_ms:8.1f} ms total")
+            previous_ms = elapsed_ms
+        return "\n".join(lines)
+
+
+def parse_report(text):
+    """A function to return the phases of a report as a list of (phase, total ms)."""
+    marks = []
+    for line in text.splitlines():
+        if line.startswith(REPORT_PREFIX):
+            fields = line[len(REPORT_PREFIX):].split()
+            marks.append((' '.join(fields[:-5]), float(fields[-3])))
+    return marks
+
+
+def launch(platform, timeout):
+    """A function to start the designer once, until its first frame, and return its phases and the wall time."""
+    import subprocess
+
+    env = dict(os.environ)
+    if platform:
+        env['QT_QPA_PLATFORM'] = platform
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, DESIGNER_SCRIPT, '--startup-report', '--quit-after-startup'],
+                            env=env, capture_output=True, text=True, timeout=timeout)
+    wall_ms = (time.perf_counter() - start) * 1000
+    marks = parse_report(result.stderr)
+    if result.returncode != 0 or not marks:
+        raise RuntimeError(f"The designer did not report its startup:\n{result.stderr}")
+    return marks, wall_ms
+
+
+def main(argv=None):
+    import argparse
+    import statistics
+
+    parser = argparse.ArgumentParser(description="Measure the designer's time to first frame.")
+    parser.add_argument('--runs', type=int, default=5, help="launches to measure")
+    parser.add_argument('--platform', default='offscreen',
+                        help="Qt platform to launch on, empty for the default (default: offscreen)")
+    parser.add_argument('--timeout', type=float, default=60, help="seconds to wait for each launch")
+    args = parser.parse_args(argv)
+
+    runs = [launch(args.platform, args.timeout) for _ in range(args.runs)]
+
+    print(f"{'phase':<14}{'median':>10}{'min':>10}{'max':>10}  (ms since start, {args.runs} runs)")
+    for index, (phase, elapsed_ms) in enumerate(runs[0][0]):
+        times = [marks[index][1] for marks, wall_ms in runs]
+        print(f"{phase:<14}{statistics.median(times):10.1f}{min(times):10.1f}{max(times):10.1f}")
+    walls = [wall_ms for marks, wall_ms in runs]
+    print(f"{'process':<14}{statistics.median(walls):10.1f}{min(walls):10.1f}{max(walls):10.1f}"
+          f"  (launch to exit, with interpreter startup and teardown)")
+
+
+if __name__ == '__main__':
+    main()
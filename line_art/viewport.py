@@ -0,0 +1,104 @@
+# viewport.py - Raster and OpenGL viewports for the design's graphics view.
+# By default QGraphicsView paints into a raster viewport, so every rectangle is rasterized on the CPU,
+# which dominates frame time at 4K with thick or antialiased pens. The view can instead paint into a
+# QOpenGLWidget, where Qt's OpenGL paint engine draws the rectangles (on a GPU, or with Mesa's
+# llvmpipe on machines without one). Both viewports come with view settings tuned for a design that
+# changes almost everywhere on every frame. OffscreenGL gives the benchmark the same paint engine
+# without a window.
+
+from PyQt5.QtGui import (QOffscreenSurface, QOpenGLContext, QOpenGLFramebufferObject,
+                         QOpenGLFramebufferObjectFormat, QOpenGLPaintDevice, QPainter, QSurfaceFormat)
+from PyQt5.QtWidgets import QGraphicsView, QOpenGLWidget
+
+_opengl_available = None
+
+
+def opengl_available():
+    """A function to return whether an OpenGL context can be created. The QApplication must already exist."""
+    global _opengl_available
+    if _opengl_available is None:
+        _opengl_available = QOpenGLContext().create()
+    return _opengl_available
+
+
+def surface_format(antialias):
+    """A function to return the surface format of an OpenGL viewport.
+
+    The OpenGL paint engine only antialiases with multisampling, so antialiased views get 4 samples.
+    """
+    surface = QSurfaceFormat.defaultFormat()
+    surface.setSamples(4 if antialias else 0)
+    return surface
+
+
+def use_opengl_viewport(view, antialias=False):
+    """A function to make view paint through a QOpenGLWidget.
+
+    The whole viewport is redrawn on every update: the design covers most of it, and the OpenGL engine
+    draws a full frame faster than it works out and clips to a set of changed regions. Items set their
+    own pen and brush, so the painter state is not saved around each one.
+    """
+    viewport = QOpenGLWidget()
+    viewport.setFormat(surface_format(antialias))
+    view.setViewport(viewport)
+    view.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+    view.setCacheMode(QGraphicsView.CacheNone)
+    view.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
+
+
+def use_raster_viewport(view):
+    """A function to make view paint through a plain raster viewport.
+
+    The background gradient is cached as a pixmap, since the view never scrolls, and the default
+    minimal viewport updates are kept, which only repaint the parts of the view that changed.
+    """
+    view.setViewport(None)
+    view.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+    view.setCacheMode(QGraphicsView.CacheBackground)
+    view.setOptimizationFlags(QGraphicsView.DontSavePainterState)
+
+
+class OffscreenGL:
+    """A class to paint into an OpenGL framebuffer without a window, with the paint engine of an OpenGL viewport."""
+
+    def __init__(self, width, height, antialias=False):
+        self.context = QOpenGLContext()
+        self.context.setFormat(surface_format(antialias))
+        if not self.context.create():
+            raise RuntimeError("Could not create an OpenGL context")
+        self.surface = QOffscreenSurface()
+        self.surface.setFormat(self.context.format())
+        self.surface.create()
+        self.context.makeCurrent(self.surface)
+
+        framebuffer_format = QOpenGLFramebufferObjectFormat()
+        framebuffer_format.setAttachment(QOpenGLFramebufferObject.CombinedDepthStencil)
+        framebuffer_format.setSamples(4 if antialias else 0)
+        self.framebuffer = QOpenGLFramebufferObject(width, height, framebuffer_format)
+        self.device = QOpenGLPaintDevice(width, height)
+        self.antialias = antialias
+
+        # glFinish, to wait for the drawing, comes with the desktop OpenGL functions (None on OpenGL ES)
+        self.functions = self.context.versionFunctions()
+        if self.functions is not None:
+            self.functions.initializeOpenGLFunctions()
+
+    def paint(self, draw):
+        """A method to call draw(painter) on the framebuffer and wait for OpenGL to finish drawing it.
+
+        Where glFinish is not available, drawing still queued in the driver is not waited for.
+        """
+        self.context.makeCurrent(self.surface)
+        self.framebuffer.bind()
+        painter = QPainter(self.device)
+        painter.setRenderHint(QPainter.Antialiasing, self.antialias)
+        draw(painter)
+        painter.end()
+        if self.functions is not None:
+            self.functions.glFinish()
+        self.framebuffer.release()
+
+    def image(self):
+        """A method to return the framebuffer's contents as a QImage."""
+        self.context.makeCurrent(self.surface)
+        return self.framebuffer.toImage()